@@ -1,12 +1,208 @@
 import numpy as np
-import random
+import re
+from numba import njit, prange
 from typing import Dict, List, Any, Tuple
 
+from common import byte_counts
+
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _fitness_from_sums(n_logs: int, shift: float, sum_1: float, sum_2: float, sum_3: float) -> float:
+    mean_deviation = sum_1 / n_logs
+    mean_square = sum_2 / n_logs
+    avg_score = shift + mean_deviation
+    variance = mean_square - mean_deviation * mean_deviation
+    third_moment = sum_3 / n_logs - 3.0 * mean_deviation * mean_square + 2.0 * mean_deviation ** 3
+    
+    if variance > 0:
+        skewness = third_moment / variance ** 1.5
+    else:
+        variance = 0.0
+        skewness = 0.0
+    
+    return (variance * 2.0) + (avg_score * 0.5) + (max(0.0, skewness) * 1.0)
+
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _calculate_fitness(anomaly_scores: np.ndarray) -> float:
+    n_logs = anomaly_scores.shape[0]
+    if n_logs <= 1:
+        return 0.0
+    
+    # Power sums in a single pass, shifted by the first score so that the
+    # central moments derived from them do not cancel catastrophically
+    shift = float(anomaly_scores[0])
+    sum_1 = 0.0
+    sum_2 = 0.0
+    sum_3 = 0.0
+    for row in range(n_logs):
+        deviation = anomaly_scores[row] - shift
+        sum_1 += deviation
+        sum_2 += deviation * deviation
+        sum_3 += deviation * deviation * deviation
+    
+    return _fitness_from_sums(n_logs, shift, sum_1, sum_2, sum_3)
+
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _rank_one_fitness(scores: np.ndarray, column: np.ndarray, step: np.float32, scale: np.float32,
+                      new_scores: np.ndarray) -> float:
+    # Writes (scores + step * column) * scale into new_scores and accumulates
+    # the shifted power sums of the result in the same pass
+    n_logs = scores.shape[0]
+    shift = float((scores[0] + step * column[0]) * scale)
+    sum_1 = 0.0
+    sum_2 = 0.0
+    sum_3 = 0.0
+    for row in range(n_logs):
+        value = (scores[row] + step * column[row]) * scale
+        new_scores[row] = value
+        deviation = value - shift
+        sum_1 += deviation
+        sum_2 += deviation * deviation
+        sum_3 += deviation * deviation * deviation
+    
+    if n_logs <= 1:
+        return 0.0
+    return _fitness_from_sums(n_logs, shift, sum_1, sum_2, sum_3)
+
+@njit(cache=True)
+def _score_logs(solution: np.ndarray, feature_columns: np.ndarray) -> np.ndarray:
+    anomaly_scores = np.zeros(feature_columns.shape[1], dtype=feature_columns.dtype)
+    for col in range(feature_columns.shape[0]):
+        anomaly_scores += np.float32(solution[col]) * feature_columns[col]
+    return anomaly_scores
+
+@njit(cache=True)
+def _draw_moves(rng: np.random.Generator, colony_size: int, n_features: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    others = rng.integers(0, colony_size - 1, colony_size)
+    dimensions = rng.integers(0, n_features, colony_size)
+    phis = rng.uniform(-1.0, 1.0, colony_size)
+    return others, dimensions, phis
+
+@njit(cache=True)
+def _partner_value(food_sources: np.ndarray, index: int, other_index: int, dimension: int) -> float:
+    # other_index is drawn from colony_size - 1 slots; skip over index itself
+    if other_index >= index:
+        other_index += 1
+    return food_sources[other_index, dimension]
+
+@njit(cache=True)
+def _produce_new_solution(food_sources: np.ndarray, index: int, partner_value: float,
+                          dimension: int, phi: float, solution: np.ndarray) -> float:
+    solution[:] = food_sources[index]
+    
+    old_value = solution[dimension]
+    new_value = old_value + phi * (old_value - partner_value)
+    
+    solution[dimension] = max(0.0, min(1.0, new_value))
+    
+    # Sources sum to one, so only the touched entry moves the total;
+    # the candidate is left unnormalized until it is accepted
+    return 1.0 - old_value + solution[dimension]
+
+@njit(cache=True)
+def _send_bee(food_sources: np.ndarray, source_scores: np.ndarray, fitness_cache: np.ndarray,
+              trials: np.ndarray, index: int, feature_columns: np.ndarray,
+              partner_value: float, dimension: int, phi: float,
+              new_solution: np.ndarray, new_scores: np.ndarray) -> float:
+    total = _produce_new_solution(food_sources, index, partner_value, dimension, phi, new_solution)
+    
+    # Only one weight moved, so the candidate's scores are a rank-one update
+    # of the cached scores for this source, rescaled by the new total
+    step = np.float32(new_solution[dimension] - food_sources[index, dimension])
+    scale = np.float32(1.0 / total)
+    new_fitness = _rank_one_fitness(source_scores[index], feature_columns[dimension], step, scale, new_scores)
+    
+    gain = new_fitness - fitness_cache[index]
+    if gain > 0:
+        food_sources[index] = new_solution
+        food_sources[index] /= total
+        source_scores[index] = new_scores
+        fitness_cache[index] = new_fitness
+        trials[index] = 0
+        return gain
+    
+    trials[index] += 1
+    return 0.0
+
+@njit(cache=True, parallel=True)
+def _employed_phase(food_sources: np.ndarray, source_scores: np.ndarray, fitness_cache: np.ndarray,
+                    trials: np.ndarray, feature_columns: np.ndarray, others: np.ndarray,
+                    dimensions: np.ndarray, phis: np.ndarray,
+                    new_solutions: np.ndarray, new_scores: np.ndarray) -> None:
+    # Partner values are read before any bee moves, since a partner's row may
+    # be rewritten by another thread mid-phase. Each employed bee then only
+    # touches its own source, so bees run in parallel with one scratch row each
+    colony_size = food_sources.shape[0]
+    partners = np.empty(colony_size)
+    for i in range(colony_size):
+        partners[i] = _partner_value(food_sources, i, others[i], dimensions[i])
+    
+    for i in prange(colony_size):
+        _send_bee(food_sources, source_scores, fitness_cache, trials, i, feature_columns,
+                  partners[i], dimensions[i], phis[i], new_solutions[i], new_scores[i])
+
+@njit(cache=True)
+def _abc_search(food_sources: np.ndarray, source_scores: np.ndarray, fitness_cache: np.ndarray,
+                trials: np.ndarray, feature_columns: np.ndarray, max_iterations: int, limit: int,
+                rng: np.random.Generator) -> Tuple[np.ndarray, float]:
+    colony_size, n_features = food_sources.shape
+    
+    # The best source is maintained incrementally on accepted moves
+    # instead of rescanning fitness_cache after every phase
+    best_idx = np.argmax(fitness_cache)
+    best_scores = source_scores[best_idx].copy()
+    best_fitness = fitness_cache[best_idx]
+    
+    # Scratch buffers reused by every candidate in the search, one row per bee
+    new_solutions = np.empty((colony_size, n_features))
+    new_scores = np.empty(source_scores.shape, dtype=source_scores.dtype)
+    
+    for iteration in range(max_iterations):
+        others, dimensions, phis = _draw_moves(rng, colony_size, n_features)
+        _employed_phase(food_sources, source_scores, fitness_cache, trials, feature_columns,
+                        others, dimensions, phis, new_solutions, new_scores)
+        i = np.argmax(fitness_cache)
+        if fitness_cache[i] > best_fitness:
+            best_scores[:] = source_scores[i]
+            best_fitness = fitness_cache[i]
+        
+        # Roulette-wheel selection of one source per onlooker
+        cumulative = np.cumsum(fitness_cache)
+        if cumulative[-1] > 0:
+            picks = np.searchsorted(cumulative, rng.random(colony_size) * cumulative[-1], side='right')
+        else:
+            picks = rng.integers(0, colony_size, colony_size)
+        
+        others, dimensions, phis = _draw_moves(rng, colony_size, n_features)
+        for onlooker in range(colony_size):
+            i = picks[onlooker]
+            partner = _partner_value(food_sources, i, others[onlooker], dimensions[onlooker])
+            gain = _send_bee(food_sources, source_scores, fitness_cache, trials, i, feature_columns,
+                             partner, dimensions[onlooker], phis[onlooker],
+                             new_solutions[0], new_scores[0])
+            if gain > 0 and fitness_cache[i] > best_fitness:
+                best_scores[:] = source_scores[i]
+                best_fitness = fitness_cache[i]
+        
+        for i in range(colony_size):
+            if trials[i] > limit:
+                solution = rng.random(n_features)
+                food_sources[i] = solution / solution.sum()
+                source_scores[i] = _score_logs(food_sources[i], feature_columns)
+                new_fitness = _calculate_fitness(source_scores[i])
+                fitness_cache[i] = new_fitness
+                trials[i] = 0
+                if new_fitness > best_fitness:
+                    best_scores[:] = source_scores[i]
+                    best_fitness = new_fitness
+    
+    return best_scores, best_fitness
+
 class ABCLogAnalyzer:
     def __init__(self, colony_size: int = 20, max_iterations: int = 50, limit: int = 10):
         self.colony_size = colony_size
         self.max_iterations = max_iterations
         self.limit = limit
+        self.rng = np.random.default_rng()
         
         self.suspicious_patterns = {
             'location_risk': {
@@ -31,6 +227,20 @@ class ABCLogAnalyzer:
             }
         }
         
+        for levels in self.suspicious_patterns.values():
+            for level, values in levels.items():
+                levels[level] = frozenset(values)
+        
+        self._location_scores = self._risk_scores(self.suspicious_patterns['location_risk'])
+        self._port_scores = self._risk_scores(self.suspicious_patterns['port_risk'])
+        self._protocol_scores = self._risk_scores(self.suspicious_patterns['protocol_risk'])
+        self._event_scores = self._risk_scores(self.suspicious_patterns['event_risk'])
+        
+        self._process_high_rx = self._compile_substring_regex(self.suspicious_patterns['process_risk']['high'])
+        self._process_medium_rx = self._compile_substring_regex(self.suspicious_patterns['process_risk']['medium'])
+        self._filename_rx = self._compile_substring_regex(['exploit', 'malware', 'hack', 'backdoor'])
+        self._privileged_users = frozenset(['root', 'admin', 'administrator'])
+        
     def analyze(self, logs: List[Dict[str, Any]]) -> Dict[str, Any]:
         if not logs:
             return {
@@ -42,58 +252,19 @@ class ABCLogAnalyzer:
             
         feature_vectors = self._extract_features(logs)
         
-        food_sources = self._initialize_food_sources(feature_vectors)
+        feature_columns = np.ascontiguousarray(feature_vectors.T)
         
-        trials = [0] * len(food_sources)
-        best_solution = None
-        best_fitness = 0
+        food_sources = self._initialize_food_sources(feature_vectors)
+        source_scores = food_sources.astype(np.float32) @ feature_columns
+        fitness_cache = np.array([_calculate_fitness(scores) for scores in source_scores])
+        trials = np.zeros(len(food_sources), dtype=np.int64)
         
-        for iteration in range(self.max_iterations):
-            for i in range(len(food_sources)):
-                new_solution = self._produce_new_solution(food_sources, i, feature_vectors)
-                new_fitness = self._calculate_fitness(new_solution, feature_vectors)
-                current_fitness = self._calculate_fitness(food_sources[i], feature_vectors)
-                
-                if new_fitness > current_fitness:
-                    food_sources[i] = new_solution
-                    trials[i] = 0
-                else:
-                    trials[i] += 1
-            
-            fitness_values = [self._calculate_fitness(source, feature_vectors) for source in food_sources]
-            sum_fitness = sum(fitness_values)
-            probabilities = [fitness / sum_fitness if sum_fitness > 0 else 1.0/len(fitness_values) for fitness in fitness_values]
-            
-            i = 0
-            count = 0
-            while count < len(food_sources):
-                if random.random() < probabilities[i]:
-                    count += 1
-                    new_solution = self._produce_new_solution(food_sources, i, feature_vectors)
-                    new_fitness = self._calculate_fitness(new_solution, feature_vectors)
-                    current_fitness = self._calculate_fitness(food_sources[i], feature_vectors)
-                    
-                    if new_fitness > current_fitness:
-                        food_sources[i] = new_solution
-                        trials[i] = 0
-                    else:
-                        trials[i] += 1
-                        
-                i = (i + 1) % len(food_sources)
-            
-            for i in range(len(trials)):
-                if trials[i] > self.limit:
-                    food_sources[i] = self._generate_random_solution(feature_vectors)
-                    trials[i] = 0
-            
-            current_best_idx = np.argmax(fitness_values)
-            current_best_fitness = fitness_values[current_best_idx]
-            
-            if best_solution is None or current_best_fitness > best_fitness:
-                best_solution = food_sources[current_best_idx]
-                best_fitness = current_best_fitness
+        best_scores, best_fitness = _abc_search(
+            food_sources, source_scores, fitness_cache, trials, feature_columns,
+            self.max_iterations, self.limit, self.rng
+        )
         
-        anomaly_score, detected_anomalies = self._evaluate_best_solution(best_solution, logs, feature_vectors)
+        anomaly_score, detected_anomalies = self._evaluate_best_solution(best_scores, logs, feature_vectors)
         
         return {
             "algorithm": "abc",
@@ -102,143 +273,106 @@ class ABCLogAnalyzer:
             "confidence": best_fitness
         }
         
-    def _extract_features(self, logs: List[Dict[str, Any]]) -> np.ndarray:
-        features = np.zeros((len(logs), 8))
-        
-        for i, log in enumerate(logs):
-            location = log.get('location', '')
-            if location in self.suspicious_patterns['location_risk']['high']:
-                features[i, 0] = 1.0
-            elif location in self.suspicious_patterns['location_risk']['medium']:
-                features[i, 0] = 0.5
-                
-            dest_port = log.get('destination_port', 0)
-            if dest_port in self.suspicious_patterns['port_risk']['high']:
-                features[i, 1] = 1.0
-            elif dest_port in self.suspicious_patterns['port_risk']['medium']:
-                features[i, 1] = 0.5
-                
-            protocol = log.get('protocol', '')
-            if protocol in self.suspicious_patterns['protocol_risk']['high']:
-                features[i, 2] = 1.0
-            elif protocol in self.suspicious_patterns['protocol_risk']['medium']:
-                features[i, 2] = 0.5
-                
-            process = log.get('process_name', '').lower()
-            if any(risk in process for risk in self.suspicious_patterns['process_risk']['high']):
-                features[i, 3] = 1.0
-            elif any(risk in process for risk in self.suspicious_patterns['process_risk']['medium']):
-                features[i, 3] = 0.5
-                
-            event_type = log.get('event_type', '').lower()
-            if event_type in self.suspicious_patterns['event_risk']['high']:
-                features[i, 4] = 1.0
-            elif event_type in self.suspicious_patterns['event_risk']['medium']:
-                features[i, 4] = 0.5
-                
-            if log.get('status', '').lower() == 'failed':
-                features[i, 5] = 1.0
-                
-            bytes_sent = log.get('bytes_sent', 0)
-            bytes_received = log.get('bytes_received', 0)
-            if bytes_received > 0:
-                ratio = bytes_sent / bytes_received if bytes_received > 0 else 0
-                if ratio > 5.0:
-                    features[i, 6] = 1.0
-                elif ratio > 1.0:
-                    features[i, 6] = 0.5
-            elif bytes_sent > 10000:  # Large outbound with no response
-                features[i, 6] = 1.0
-                
-            filename = log.get('filename', '').lower()
-            username = log.get('username', '').lower()
-            
-            if filename and any(pattern in filename for pattern in ['exploit', 'malware', 'hack', 'backdoor']):
-                features[i, 7] = 1.0
-            elif username == 'root' or username == 'admin' or username == 'administrator':
-                features[i, 7] = 0.7
-        
-        return features
-        
-    def _initialize_food_sources(self, feature_vectors: np.ndarray) -> List[np.ndarray]:
-        food_sources = []
-        for _ in range(self.colony_size):
-            food_sources.append(self._generate_random_solution(feature_vectors))
-        return food_sources
+    @staticmethod
+    def _compile_substring_regex(patterns) -> re.Pattern:
+        return re.compile('|'.join(re.escape(pattern) for pattern in sorted(patterns)))
     
-    def _generate_random_solution(self, feature_vectors: np.ndarray) -> np.ndarray:
-        solution = np.random.uniform(0.0, 1.0, size=feature_vectors.shape[1])
-        solution /= solution.sum()
-        return solution
+    @staticmethod
+    def _risk_scores(levels: Dict[str, frozenset]) -> Dict[Any, float]:
+        scores = {value: 0.5 for value in levels['medium']}
+        scores.update({value: 1.0 for value in levels['high']})
+        return scores
     
-    def _produce_new_solution(self, food_sources: List[np.ndarray], index: int, feature_vectors: np.ndarray) -> np.ndarray:
-        solution = food_sources[index].copy()
+    @staticmethod
+    def _risk_column(values: List[Any], scores: Dict[Any, float]) -> np.ndarray:
+        return np.fromiter((scores.get(value, 0.0) for value in values), dtype=np.float32, count=len(values))
         
-        other_index = random.randrange(len(food_sources))
-        while other_index == index:
-            other_index = random.randrange(len(food_sources))
-            
-        dimension = random.randrange(len(solution))
+    def _extract_features(self, logs: List[Dict[str, Any]]) -> np.ndarray:
+        n = len(logs)
+        features = np.zeros((n, 8), dtype=np.float32)
         
-        phi = random.uniform(-1, 1)
-        solution[dimension] += phi * (solution[dimension] - food_sources[other_index][dimension])
+        locations = [log.get('location', '') for log in logs]
+        dest_ports = [log.get('destination_port', 0) for log in logs]
+        protocols = [log.get('protocol', '') for log in logs]
+        processes = [log.get('process_name', '').lower() for log in logs]
+        event_types = [log.get('event_type', '').lower() for log in logs]
+        statuses = [log.get('status', '').lower() for log in logs]
+        filenames = [log.get('filename', '').lower() for log in logs]
+        usernames = [log.get('username', '').lower() for log in logs]
+        bytes_sent = byte_counts([log.get('bytes_sent', 0) for log in logs])
+        bytes_received = byte_counts([log.get('bytes_received', 0) for log in logs])
         
-        solution[dimension] = max(0.0, min(1.0, solution[dimension]))
+        features[:, 0] = self._risk_column(locations, self._location_scores)
+        features[:, 1] = self._risk_column(dest_ports, self._port_scores)
+        features[:, 2] = self._risk_column(protocols, self._protocol_scores)
         
-        solution /= solution.sum()
+        process_high = self._process_high_rx.search
+        process_medium = self._process_medium_rx.search
+        features[:, 3] = np.fromiter(
+            (1.0 if process_high(p) else 0.5 if process_medium(p) else 0.0 for p in processes),
+            dtype=np.float32, count=n
+        )
         
-        return solution
-    
-    def _calculate_fitness(self, solution: np.ndarray, feature_vectors: np.ndarray) -> float:
-        weighted_features = feature_vectors * solution
-        anomaly_scores = weighted_features.sum(axis=1)
+        features[:, 4] = self._risk_column(event_types, self._event_scores)
         
-        if len(anomaly_scores) <= 1:
-            return 0.0
-            
-        variance = np.var(anomaly_scores)
+        features[:, 5] = np.fromiter((status == 'failed' for status in statuses), dtype=bool, count=n)
         
-        avg_score = np.mean(anomaly_scores)
+        has_response = bytes_received > 0
+        ratio = np.divide(bytes_sent, bytes_received, out=np.zeros(n), where=has_response)
+        features[:, 6] = np.where(
+            has_response,
+            np.where(ratio > 5.0, 1.0, np.where(ratio > 1.0, 0.5, 0.0)),
+            np.where(bytes_sent > 10000, 1.0, 0.0)  # Large outbound with no response
+        )
         
-        skewness = np.mean(((anomaly_scores - avg_score) / np.std(anomaly_scores))**3) if np.std(anomaly_scores) > 0 else 0
+        suspicious_file = self._filename_rx.search
+        privileged_users = self._privileged_users
+        features[:, 7] = np.fromiter(
+            (1.0 if f and suspicious_file(f) else 0.7 if u in privileged_users else 0.0
+             for f, u in zip(filenames, usernames)),
+            dtype=np.float32, count=n
+        )
         
-        fitness = (variance * 2.0) + (avg_score * 0.5) + (max(0, skewness) * 1.0)
+        return features
         
-        return fitness
+    def _initialize_food_sources(self, feature_vectors: np.ndarray) -> np.ndarray:
+        food_sources = self.rng.uniform(0.0, 1.0, size=(self.colony_size, feature_vectors.shape[1]))
+        food_sources /= food_sources.sum(axis=1, keepdims=True)
+        return food_sources
     
-    def _evaluate_best_solution(self, solution: np.ndarray, logs: List[Dict[str, Any]], feature_vectors: np.ndarray) -> Tuple[float, List[Dict[str, Any]]]:
-        weighted_features = feature_vectors * solution
-        anomaly_scores = weighted_features.sum(axis=1)
+    def _evaluate_best_solution(self, best_scores: np.ndarray, logs: List[Dict[str, Any]], feature_vectors: np.ndarray) -> Tuple[float, List[Dict[str, Any]]]:
+        anomaly_scores = best_scores.astype(np.float64)
         
         max_score = np.max(anomaly_scores) if anomaly_scores.size > 0 else 1.0
         if max_score > 0:
-            anomaly_scores = anomaly_scores / max_score
+            anomaly_scores *= 1.0 / max_score
         
         threshold = 0.6
         
         anomaly_indices = np.where(anomaly_scores > threshold)[0]
         detected_anomalies = []
         
-        for idx in anomaly_indices:
+        # A feature at 1.0 marks the high-risk tier, so reasons are read off the
+        # feature rows instead of re-testing each log against the patterns
+        high_risk = feature_vectors[anomaly_indices] == 1.0
+        
+        for idx, flags in zip(anomaly_indices, high_risk):
             log = logs[idx]
             reasons = []
             
-            if log.get('location', '') in self.suspicious_patterns['location_risk']['high']:
+            if flags[0]:
                 reasons.append(f"Suspicious location: {log.get('location')}")
                 
-            if log.get('destination_port', 0) in self.suspicious_patterns['port_risk']['high']:
+            if flags[1]:
                 reasons.append(f"High-risk port: {log.get('destination_port')}")
                 
-            if log.get('protocol', '') in self.suspicious_patterns['protocol_risk']['high']:
+            if flags[2]:
                 reasons.append(f"Risky protocol: {log.get('protocol')}")
                 
-            process = log.get('process_name', '').lower()
-            for risk in self.suspicious_patterns['process_risk']['high']:
-                if risk in process:
-                    reasons.append(f"Suspicious process: {log.get('process_name')}")
-                    break
+            if flags[3]:
+                reasons.append(f"Suspicious process: {log.get('process_name')}")
                     
-            if log.get('status', '').lower() == 'failed':
+            if flags[5]:
                 reasons.append("Failed operation")
                 
             detected_anomalies.append({
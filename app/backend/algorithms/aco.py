@@ -1,8 +1,277 @@
 import numpy as np
-import random
-from typing import Dict, List, Any, Tuple
+import re
+import socket
+import time
+from numba import njit, prange, types
+from numba.typed import Dict as TypedDict
+from typing import Dict, List, Any, Tuple, NamedTuple
 from datetime import datetime
 
+from common import parse_timestamps
+
+# Largest proximity matrix worth caching (50 MB of float32)
+_MAX_PROXIMITY_CELLS = 12_500_000
+
+class ProcessedLogs(NamedTuple):
+    """Column-wise view of the logs, sorted by timestamp"""
+    timestamp: List[str]
+    source_ip: List[str]
+    destination_ip: List[str]
+    event_type: List[str]
+    location: List[str]
+    process: List[str]
+    seconds: np.ndarray
+    source_ip_code: np.ndarray
+    destination_ip_code: np.ndarray
+    location_code: np.ndarray
+    protocol_code: np.ndarray
+    port_code: np.ndarray
+    event_code: np.ndarray
+    process_code: np.ndarray
+    location_risk: np.ndarray
+    protocol_risk: np.ndarray
+    port_risk: np.ndarray
+    failed: np.ndarray                # Status 'failed' in any case
+    failed_exact: np.ndarray          # Status exactly 'failed', as the attack patterns test it
+    suspicious_file: np.ndarray
+    cluster_risk: np.ndarray
+
+@njit(cache=True, inline='always')
+def _proximity(a: int, b: int, source_ip: np.ndarray, destination_ip: np.ndarray, protocol: np.ndarray,
+               location: np.ndarray, seconds: np.ndarray, event: np.ndarray, sequence_bonus: np.ndarray) -> float:
+    # Code 0 is a missing value and never counts as a match
+    time_diff = seconds[b] - seconds[a]
+    proximity = (0.3 * ((source_ip[a] != 0) & (source_ip[a] == source_ip[b]))
+                 + 0.3 * ((destination_ip[a] != 0) & (destination_ip[a] == destination_ip[b]))
+                 + 0.1 * ((protocol[a] != 0) & (protocol[a] == protocol[b]))
+                 + 0.2 * ((location[a] != 0) & (location[a] == location[b]))
+                 + 0.3 * ((time_diff >= 0) & (time_diff <= 300))      # Within 5 minutes
+                 + 0.1 * ((time_diff > 300) & (time_diff <= 1800))    # Within 30 minutes
+                 + sequence_bonus[event[a], event[b]]
+                 + 0.5 * ((destination_ip[a] != 0) & (destination_ip[a] == source_ip[b])))
+    
+    return min(1.0, proximity)
+
+@njit(cache=True, parallel=True)
+def _proximity_matrix(source_ip: np.ndarray, destination_ip: np.ndarray, protocol: np.ndarray,
+                      location: np.ndarray, seconds: np.ndarray, event: np.ndarray,
+                      sequence_bonus: np.ndarray) -> np.ndarray:
+    n = seconds.shape[0]
+    matrix = np.empty((n, n), dtype=np.float32)
+    for a in prange(n):
+        for b in range(n):
+            matrix[a, b] = _proximity(a, b, source_ip, destination_ip, protocol, location,
+                                      seconds, event, sequence_bonus)
+    return matrix
+
+@njit(cache=True)
+def _select_starting_node(attractiveness, u):
+    n = attractiveness.shape[0]
+    total = attractiveness.sum()
+    if total == 0:
+        return min(int(u * n), n - 1)
+    
+    cumulative = np.cumsum(attractiveness)
+    node = np.searchsorted(cumulative, u * total, side='right')
+    return min(node, n - 1)
+
+@njit(cache=True)
+def _pheromone_rows(n: int, edge_a: np.ndarray, edge_b: np.ndarray, edge_deposit: np.ndarray,
+                    n_edges: int, background: float, decay: float,
+                    alpha: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # CSR view of the touched edges, listed from both endpoints, holding tau ** alpha
+    # so the walk never raises pheromones to a power itself
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    for e in range(n_edges):
+        indptr[edge_a[e] + 1] += 1
+        indptr[edge_b[e] + 1] += 1
+    indptr = np.cumsum(indptr)
+    
+    cursor = indptr[:-1].copy()
+    neighbors = np.empty(2 * n_edges, dtype=np.int64)
+    values = np.empty(2 * n_edges)
+    for e in range(n_edges):
+        a = edge_a[e]
+        b = edge_b[e]
+        value = background + decay * edge_deposit[e]
+        if alpha != 1.0:
+            value = value ** alpha
+        neighbors[cursor[a]] = b
+        values[cursor[a]] = value
+        cursor[a] += 1
+        neighbors[cursor[b]] = a
+        values[cursor[b]] = value
+        cursor[b] += 1
+    return indptr, neighbors, values
+
+@njit(cache=True)
+def _select_next_node(current: int, visited: np.ndarray, weights: np.ndarray, indptr: np.ndarray,
+                      neighbors: np.ndarray, values: np.ndarray, background: float,
+                      attractiveness_beta: np.ndarray, exploit: bool, u: float) -> int:
+    n = attractiveness_beta.shape[0]
+    for node in range(n):
+        weights[node] = 0.0 if visited[node] else background * attractiveness_beta[node]
+    
+    for k in range(indptr[current], indptr[current + 1]):
+        node = neighbors[k]
+        if not visited[node]:
+            weights[node] = values[k] * attractiveness_beta[node]
+    
+    total = 0.0
+    best_node = -1
+    for node in range(n):
+        if visited[node]:
+            continue
+        total += weights[node]
+        if best_node < 0 or weights[node] > weights[best_node]:
+            best_node = node
+    
+    if best_node < 0:
+        return -1
+    
+    if total <= 0:
+        for node in range(n):
+            weights[node] = 0.0 if visited[node] else 1.0
+        total = weights.sum()
+    
+    if exploit:
+        return best_node
+    
+    cumulative = np.cumsum(weights)
+    node = np.searchsorted(cumulative, u * total, side='right')
+    return min(node, n - 1)
+
+@njit(cache=True)
+def _walk_ant(uniforms: np.ndarray, exploit: np.ndarray, path: np.ndarray, visited: np.ndarray,
+              weights: np.ndarray, indptr: np.ndarray, neighbors: np.ndarray, values: np.ndarray,
+              background_weight: float, attractiveness: np.ndarray, attractiveness_beta: np.ndarray,
+              location: np.ndarray, protocol: np.ndarray, event: np.ndarray, source_ip: np.ndarray,
+              destination_ip: np.ndarray, seconds: np.ndarray, sequence_bonus: np.ndarray,
+              proximity_matrix: np.ndarray) -> Tuple[int, float]:
+    max_length = path.shape[0]
+    current_node = _select_starting_node(attractiveness, uniforms[0])
+    path[0] = current_node
+    length = 1
+    visited[:] = False
+    visited[current_node] = True
+    path_score = attractiveness[current_node]
+    
+    while length < max_length:
+        next_node = _select_next_node(
+            current_node, visited, weights, indptr, neighbors, values, background_weight,
+            attractiveness_beta, exploit[length], uniforms[length]
+        )
+        
+        if next_node < 0:
+            break
+        
+        path[length] = next_node
+        length += 1
+        visited[next_node] = True
+        
+        if proximity_matrix.shape[0] > 0:
+            proximity = proximity_matrix[current_node, next_node]
+        else:
+            proximity = _proximity(current_node, next_node, source_ip, destination_ip,
+                                   protocol, location, seconds, event, sequence_bonus)
+        
+        path_score += attractiveness[next_node] * proximity
+        current_node = next_node
+    
+    return length, path_score / length
+
+@njit(cache=True, parallel=True)
+def _run_aco(initial_pheromone: float, attractiveness: np.ndarray, attractiveness_beta: np.ndarray,
+             location: np.ndarray, protocol: np.ndarray, event: np.ndarray, source_ip: np.ndarray,
+             destination_ip: np.ndarray, seconds: np.ndarray, sequence_bonus: np.ndarray,
+             proximity_matrix: np.ndarray, num_ants: int, iterations: int, alpha: float,
+             evaporation: float, q0: float, max_length: int, rng: np.random.Generator):
+    n = attractiveness.shape[0]
+    paths = np.full((num_ants, max_length), -1, dtype=np.int32)
+    lengths = np.empty(num_ants, dtype=np.int64)
+    scores = np.empty(num_ants)
+    # Ants walk in parallel, so each one gets its own scratch rows
+    visited = np.zeros((num_ants, n), dtype=np.bool_)
+    weights = np.empty((num_ants, n))
+    
+    # Pheromones are sparse: every edge holds the evaporating background level,
+    # touched edges (a < b) add a deposit kept in a slot-indexed COO store.
+    # Deposits are stored undecayed, so the pheromone on a touched edge is
+    # background + decay * deposit and evaporation only scales two scalars.
+    background = initial_pheromone
+    decay = 1.0
+    capacity = max(1, iterations * num_ants * (max_length - 1))
+    slots = TypedDict.empty(key_type=types.int64, value_type=types.int64)
+    edge_a = np.empty(capacity, dtype=np.int64)
+    edge_b = np.empty(capacity, dtype=np.int64)
+    edge_deposit = np.empty(capacity)
+    n_edges = 0
+    
+    for iteration in range(iterations):
+        # One uniform per ant step: column 0 picks the start node, column k the k-th move.
+        # The exploit coins are drawn up front too, so the parallel walk never touches the RNG
+        uniforms = rng.random((num_ants, max_length))
+        exploit = rng.random((num_ants, max_length)) < q0
+        indptr, neighbors, values = _pheromone_rows(n, edge_a, edge_b, edge_deposit, n_edges,
+                                                    background, decay, alpha)
+        background_weight = background ** alpha
+        
+        for ant in prange(num_ants):
+            lengths[ant], scores[ant] = _walk_ant(
+                uniforms[ant], exploit[ant], paths[ant], visited[ant], weights[ant],
+                indptr, neighbors, values, background_weight, attractiveness, attractiveness_beta,
+                location, protocol, event, source_ip, destination_ip, seconds, sequence_bonus,
+                proximity_matrix
+            )
+        
+        background *= 1 - evaporation
+        decay *= 1 - evaporation
+        if decay < 1e-150:
+            edge_deposit[:n_edges] *= decay
+            decay = 1.0
+        
+        for ant in range(num_ants):
+            score = scores[ant]
+            for i in range(lengths[ant] - 1):
+                a = min(paths[ant, i], paths[ant, i + 1])
+                b = max(paths[ant, i], paths[ant, i + 1])
+                key = a * n + b
+                if key in slots:
+                    slot = slots[key]
+                else:
+                    slot = n_edges
+                    slots[key] = slot
+                    edge_a[slot] = a
+                    edge_b[slot] = b
+                    edge_deposit[slot] = 0.0
+                    n_edges += 1
+                edge_deposit[slot] += score / decay
+    
+    return edge_a[:n_edges], edge_b[:n_edges], background + decay * edge_deposit[:n_edges], background
+
+@njit(cache=True)
+def _find(parent: np.ndarray, node: int) -> int:
+    while parent[node] != node:
+        parent[node] = parent[parent[node]]
+        node = parent[node]
+    return node
+
+@njit(cache=True)
+def _connected_components(n: int, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    # Union by smaller index, so every label is the first log of its component
+    parent = np.arange(n)
+    for i in range(rows.shape[0]):
+        a = _find(parent, rows[i])
+        b = _find(parent, cols[i])
+        if a < b:
+            parent[b] = a
+        elif b < a:
+            parent[a] = b
+    
+    for node in range(n):
+        parent[node] = _find(parent, node)
+    return parent
+
 class ACOLogAnalyzer:
     def __init__(self, num_ants: int = 20, iterations: int = 50, 
                  alpha: float = 1.0, beta: float = 2.0, evaporation: float = 0.1,
@@ -14,6 +283,7 @@ class ACOLogAnalyzer:
         self.beta = beta    # importance of heuristic information
         self.evaporation = evaporation
         self.q0 = q0        # exploitation vs exploration balance
+        self.rng = np.random.default_rng()
         
         # Define risk factors for different log attributes
         self.risk_factors = {
@@ -64,6 +334,31 @@ class ACOLogAnalyzer:
             'exploit', 'tool', 'malware', 'hack', 'crack',
             'trojan', 'worm', 'virus', 'ransom', 'backdoor'
         ]
+        self._suspicious_file_rx = re.compile('|'.join(map(re.escape, self.suspicious_file_patterns)))
+        
+        self.event_sequence = {
+            ('login', 'file_download'): 0.4,
+            ('file_download', 'lateral_movement'): 0.5,
+            ('login', 'lateral_movement'): 0.3,
+            ('port_scan', 'login'): 0.3,
+            ('port_scan', 'lateral_movement'): 0.3
+        }
+        
+        # Code 0 means no risky process matched; code k is the k-th entry
+        self._process_risk = np.array([0.0] + list(self.risk_factors['process'].values()))
+        
+        # Known event types get fixed codes, everything else shares the trailing 'unknown' code
+        event_names = list(dict.fromkeys(
+            list(self.risk_factors['event_type'])
+            + [name for pair in self.event_sequence for name in pair]
+            + ['unknown']
+        ))
+        self._event_index = {name: code for code, name in enumerate(event_names)}
+        self._unknown_event = self._event_index['unknown']
+        self._event_risk = self._risk_table(event_names, self.risk_factors['event_type'])
+        self._sequence_bonus = np.zeros((len(event_names), len(event_names)), dtype=np.float32)
+        for (first, second), bonus in self.event_sequence.items():
+            self._sequence_bonus[self._event_index[first], self._event_index[second]] = bonus
 
     def analyze(self, logs: List[Dict[str, Any]]) -> Dict[str, Any]:
         if not logs:
@@ -79,57 +374,30 @@ class ACOLogAnalyzer:
         
         node_attractiveness = self._calculate_node_attractiveness(processed_logs)
         
-        n_logs = len(processed_logs)
-        pheromones = np.ones((n_logs, n_logs)) * 0.1
+        n_logs = len(processed_logs.timestamp)
+        max_length = min(n_logs, 10)
         
-        best_path = []
-        best_score = 0
-        
-        for iteration in range(self.iterations):
-            all_paths = []
-            all_scores = []
-            
-            for ant in range(self.num_ants):
-                current_node = self._select_starting_node(node_attractiveness)
-                path = [current_node]
-                visited = set([current_node])
-                path_score = node_attractiveness[current_node]
-                
-                while len(path) < min(n_logs, 10):  
-                    next_node = self._select_next_node(
-                        current_node, visited, pheromones, node_attractiveness
-                    )
-                    
-                    if next_node is None:
-                        break
-                        
-                    path.append(next_node)
-                    visited.add(next_node)
-                    
-                    proximity = self._calculate_proximity(
-                        processed_logs[current_node], processed_logs[next_node]
-                    )
-                    
-                    path_score += node_attractiveness[next_node] * proximity
-                    current_node = next_node
-                
-                all_paths.append(path)
-                all_scores.append(path_score / len(path) if path else 0)
-            
-            best_ant = np.argmax(all_scores)
-            if all_scores[best_ant] > best_score:
-                best_path = all_paths[best_ant]
-                best_score = all_scores[best_ant]
-            
-            pheromones = pheromones * (1 - self.evaporation)
-            
-            for ant_idx, path in enumerate(all_paths):
-                score = all_scores[ant_idx]
-                for i in range(len(path) - 1):
-                    pheromones[path[i], path[i+1]] += score
-                    pheromones[path[i+1], path[i]] += score  # Symmetric
-        
-        clusters = self._extract_clusters(pheromones, processed_logs, threshold=0.5)
+        # Precompute every pair only when that is cheaper than the walk's own proximity calls
+        walk_steps = self.iterations * self.num_ants * (max_length - 1)
+        if n_logs * n_logs <= min(walk_steps, _MAX_PROXIMITY_CELLS):
+            proximity_matrix = _proximity_matrix(
+                processed_logs.source_ip_code, processed_logs.destination_ip_code,
+                processed_logs.protocol_code, processed_logs.location_code,
+                processed_logs.seconds, processed_logs.event_code, self._sequence_bonus
+            )
+        else:
+            proximity_matrix = np.empty((0, 0), dtype=np.float32)
+        
+        edge_a, edge_b, edge_value, background = _run_aco(
+            0.1, node_attractiveness, node_attractiveness ** self.beta,
+            processed_logs.location_code, processed_logs.protocol_code, processed_logs.event_code,
+            processed_logs.source_ip_code, processed_logs.destination_ip_code,
+            processed_logs.seconds, self._sequence_bonus, proximity_matrix,
+            self.num_ants, self.iterations, self.alpha, self.evaporation, self.q0,
+            max_length, self.rng
+        )
+        
+        clusters = self._extract_clusters((edge_a, edge_b, edge_value), background, processed_logs, threshold=0.5)
         attack_patterns = self._identify_attack_patterns(clusters, processed_logs)
         suspicious_logs = self._extract_suspicious_logs(node_attractiveness, processed_logs)
         threat_score = self._calculate_threat_score(clusters, attack_patterns, suspicious_logs)
@@ -142,218 +410,176 @@ class ACOLogAnalyzer:
             "most_suspicious_logs": suspicious_logs
         }
 
-    def _preprocess_logs(self, logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Preprocess logs to extract and normalize relevant features"""
-        processed = []
-        
-        for log in logs:
-            processed_log = {
-                'original_index': len(processed),
-                'timestamp': log.get('timestamp', ''),
-                'source_ip': log.get('source_ip', ''),
-                'destination_ip': log.get('destination_ip', ''),
-                'protocol': log.get('protocol', ''),
-                'port': str(log.get('destination_port', '')),
-                'event_type': log.get('event_type', ''),
-                'status': log.get('status', ''),
-                'location': log.get('location', ''),
-                'process': log.get('process_name', ''),
-                'filename': log.get('filename', ''),
-                'username': log.get('username', ''),
-                'bytes_sent': log.get('bytes_sent', 0),
-                'bytes_received': log.get('bytes_received', 0)
-            }
-            
-            try:
-                if processed_log['timestamp'].endswith('Z'):
-                    processed_log['timestamp'] = processed_log['timestamp'][:-1] + '+00:00'
-                processed_log['datetime'] = datetime.fromisoformat(processed_log['timestamp'])
-            except (ValueError, TypeError):
-                processed_log['datetime'] = datetime.now()
-            
-            processed.append(processed_log)
-        
-        processed.sort(key=lambda x: x['datetime'])
-        
-        return processed
+    @staticmethod
+    def _encode(values: List[Any], blank_code: bool = False) -> Tuple[np.ndarray, List[Any]]:
+        """Map each distinct value to a small integer code; with blank_code, falsy values get code 0"""
+        vocabulary = {}
+        if blank_code:
+            vocabulary[None] = 0
+        codes = np.fromiter(
+            (vocabulary.setdefault(value if value or not blank_code else None, len(vocabulary))
+             for value in values),
+            dtype=np.int32, count=len(values)
+        )
+        return codes, list(vocabulary)
 
-    def _calculate_node_attractiveness(self, logs: List[Dict[str, Any]]) -> np.ndarray:
-        """Calculate the attractiveness of each log entry as a node"""
-        attractiveness = np.zeros(len(logs))
-        
-        for i, log in enumerate(logs):
-            score = 0.0
-            
-            location = log['location']
-            if location in self.risk_factors['location']:
-                score += self.risk_factors['location'][location]
-            
-            protocol = log['protocol']
-            if protocol in self.risk_factors['protocol']:
-                score += self.risk_factors['protocol'][protocol]
-            
-            port = log['port']
-            if port in self.risk_factors['port']:
-                score += self.risk_factors['port'][port]
-            
-            event_type = log['event_type']
-            if event_type in self.risk_factors['event_type']:
-                score += self.risk_factors['event_type'][event_type]
-            
-            process = log['process']
-            for risk_process, risk_score in self.risk_factors['process'].items():
-                if risk_process in process.lower():
-                    score += risk_score
+    def _parse_timestamps(self, timestamps: List[Any]) -> np.ndarray:
+        """Epoch seconds per timestamp; missing or unparseable ones fall back to the current time"""
+        utc = parse_timestamps(timestamps, utc=True)
+        seconds = utc.astype(np.int64) / 1e6
+        seconds[np.isnat(utc)] = time.time()
+        return seconds
+
+    def _preprocess_logs(self, logs: List[Dict[str, Any]]) -> ProcessedLogs:
+        """Preprocess logs into sorted, integer-coded columns"""
+        seconds = self._parse_timestamps([log.get('timestamp', '') for log in logs])
+        order = np.argsort(seconds, kind='stable')
+        logs = [logs[i] for i in order]
+        seconds = seconds[order]
+        
+        timestamps = []
+        for log in logs:
+            timestamp = log.get('timestamp', '')
+            if isinstance(timestamp, str) and timestamp.endswith('Z'):
+                timestamp = timestamp[:-1] + '+00:00'
+            timestamps.append(timestamp)
+        
+        source_ips = [log.get('source_ip', '') for log in logs]
+        destination_ips = [log.get('destination_ip', '') for log in logs]
+        event_types = [log.get('event_type', '') for log in logs]
+        locations = [log.get('location', '') for log in logs]
+        processes = [log.get('process_name', '') for log in logs]
+        
+        location_code, location_names = self._encode(locations, blank_code=True)
+        protocol_code, protocol_names = self._encode([log.get('protocol', '') for log in logs], blank_code=True)
+        port_code, port_names = self._encode([str(log.get('destination_port', '')) for log in logs])
+        event_code = np.fromiter(
+            (self._event_index.get(event, self._unknown_event) for event in event_types),
+            dtype=np.int32, count=len(event_types)
+        )
+        
+        other_ips = {}
+        
+        risky_processes = list(self.risk_factors['process'])
+        process_code = np.zeros(len(logs), dtype=np.int32)
+        for i, process in enumerate(processes):
+            process = process.lower()
+            for code, risk_process in enumerate(risky_processes, start=1):
+                if risk_process in process:
+                    process_code[i] = code
                     break
-            
-            if log['status'].lower() == 'failed':
-                score += 0.5
-            
-            filename = log['filename'].lower()
-            if filename:
-                for pattern in self.suspicious_file_patterns:
-                    if pattern in filename:
-                        score += 0.7
-                        break
-            
-            attractiveness[i] = min(1.0, score / 5.0)
         
-        return attractiveness
+        location_risk = self._risk_table(location_names, self.risk_factors['location'])
+        statuses = [log.get('status', '') for log in logs]
+        failed = np.array([status.lower() == 'failed' for status in statuses], dtype=bool)
+        
+        return ProcessedLogs(
+            timestamp=timestamps,
+            source_ip=source_ips,
+            destination_ip=destination_ips,
+            event_type=event_types,
+            location=locations,
+            process=processes,
+            seconds=seconds,
+            source_ip_code=self._ip_codes(source_ips, other_ips),
+            destination_ip_code=self._ip_codes(destination_ips, other_ips),
+            location_code=location_code,
+            protocol_code=protocol_code,
+            port_code=port_code,
+            event_code=event_code,
+            process_code=process_code,
+            location_risk=location_risk,
+            protocol_risk=self._risk_table(protocol_names, self.risk_factors['protocol']),
+            port_risk=self._risk_table(port_names, self.risk_factors['port']),
+            failed=failed,
+            failed_exact=np.array([status == 'failed' for status in statuses], dtype=bool),
+            suspicious_file=np.fromiter(
+                (self._suspicious_file_rx.search(log.get('filename', '').lower()) is not None for log in logs),
+                dtype=bool, count=len(logs)
+            ),
+            # Each log's share of its cluster's risk score
+            cluster_risk=0.3 * failed + location_risk[location_code] + self._event_risk[event_code]
+        )
 
-    def _select_starting_node(self, attractiveness: np.ndarray) -> int:
-        """Select a starting node for an ant, weighted by attractiveness"""
-        if np.sum(attractiveness) == 0:
-            return random.randint(0, len(attractiveness) - 1)
-            
-        probs = attractiveness / np.sum(attractiveness)
-        return np.random.choice(range(len(attractiveness)), p=probs)
+    @staticmethod
+    def _ip_codes(ips: List[Any], other_ips: Dict[Any, int]) -> np.ndarray:
+        """Pack IPv4 addresses into integers; 0 marks a missing IP and anything else is interned above the IPv4 range"""
+        codes = np.zeros(len(ips), dtype=np.int64)
+        for i, ip in enumerate(ips):
+            if not ip:
+                continue
+            try:
+                # inet_pton only accepts canonical dotted quads, so equal codes mean equal strings
+                codes[i] = int.from_bytes(socket.inet_pton(socket.AF_INET, ip), 'big') + 1
+            except (OSError, TypeError, ValueError):
+                codes[i] = other_ips.setdefault(ip, (1 << 32) + 1 + len(other_ips))
+        return codes
 
-    def _select_next_node(self, current: int, visited: set, pheromones: np.ndarray, 
-                          attractiveness: np.ndarray) -> int:
-        """Select the next node for an ant to visit"""
-        n = len(attractiveness)
-        unvisited = [i for i in range(n) if i not in visited]
-        
-        if not unvisited:
-            return None
-        
-        probabilities = np.zeros(len(unvisited))
-        
-        for idx, node in enumerate(unvisited):
-            tau = pheromones[current, node]
-            eta = attractiveness[node]
-            
-            probabilities[idx] = (tau ** self.alpha) * (eta ** self.beta)
-        
-        if np.sum(probabilities) > 0:
-            probabilities = probabilities / np.sum(probabilities)
-        else:
-            probabilities = np.ones_like(probabilities) / len(probabilities)
-        
-        if random.random() < self.q0:
-            best_idx = np.argmax(probabilities)
-            return unvisited[best_idx]
-        else:
-            return np.random.choice(unvisited, p=probabilities)
+    @staticmethod
+    def _risk_table(names: List[Any], risk_factors: Dict[str, float]) -> np.ndarray:
+        """Risk per code, aligned with the vocabulary returned by _encode"""
+        return np.array([risk_factors.get(name, 0.0) if name is not None else 0.0 for name in names])
 
-    def _calculate_proximity(self, log1: Dict[str, Any], log2: Dict[str, Any]) -> float:
-        """Calculate how closely related two log entries are"""
-        proximity = 0.0
-        
-        if log1['source_ip'] and log1['source_ip'] == log2['source_ip']:
-            proximity += 0.3
-        
-        if log1['destination_ip'] and log1['destination_ip'] == log2['destination_ip']:
-            proximity += 0.3
-        
-        if log1['protocol'] and log1['protocol'] == log2['protocol']:
-            proximity += 0.1
+    def _calculate_node_attractiveness(self, logs: ProcessedLogs) -> np.ndarray:
+        """Calculate the attractiveness of each log entry as a node"""
+        score = (logs.location_risk[logs.location_code]
+                 + logs.protocol_risk[logs.protocol_code]
+                 + logs.port_risk[logs.port_code]
+                 + self._event_risk[logs.event_code]
+                 + self._process_risk[logs.process_code])
+        score += 0.5 * logs.failed
+        score += 0.7 * logs.suspicious_file
+        
+        return np.minimum(1.0, score / 5.0)
+
+    def _extract_clusters(self, edges: Tuple[np.ndarray, np.ndarray, np.ndarray], background: float,
+                          logs: ProcessedLogs, threshold: float = 0.5) -> List[Dict[str, Any]]:
+        """Extract clusters of related logs as connected components of strong pheromone trails"""
+        n = len(logs.timestamp)
+        if background > threshold:
+            labels = np.zeros(n, dtype=np.int64)
+        else:
+            rows, cols, values = edges
+            strong = values > threshold
+            labels = _connected_components(n, rows[strong], cols[strong])
         
-        if log1['location'] and log1['location'] == log2['location']:
-            proximity += 0.2
+        sizes = np.bincount(labels, minlength=n)
+        risk = np.bincount(labels, weights=logs.cluster_risk, minlength=n)
         
-        time_diff = (log2['datetime'] - log1['datetime']).total_seconds()
-        if 0 <= time_diff <= 300:  # Within 5 minutes
-            proximity += 0.3
-        elif 300 < time_diff <= 1800:  # Within 30 minutes
-            proximity += 0.1
-            
-        event_sequence = {
-            ('login', 'file_download'): 0.4,
-            ('file_download', 'lateral_movement'): 0.5,
-            ('login', 'lateral_movement'): 0.3,
-            ('port_scan', 'login'): 0.3,
-            ('port_scan', 'lateral_movement'): 0.3
-        }
-        
-        key = (log1['event_type'], log2['event_type'])
-        if key in event_sequence:
-            proximity += event_sequence[key]
-            
-        if log1['destination_ip'] and log1['destination_ip'] == log2['source_ip']:
-            proximity += 0.5
-            
-        return min(1.0, proximity)
-
-    def _extract_clusters(self, pheromones: np.ndarray, logs: List[Dict[str, Any]], 
-                          threshold: float = 0.5) -> List[Dict[str, Any]]:
-        """Extract clusters of related logs based on pheromone levels"""
-        n = len(logs)
-        visited = set()
+        members = np.argsort(labels, kind='stable')
+        starts = np.cumsum(sizes) - sizes
         clusters = []
         
-        for i in range(n):
-            if i in visited:
-                continue
-                
-            cluster = [i]
-            visited.add(i)
-            
-            for j in range(n):
-                if j != i and j not in visited and pheromones[i, j] > threshold:
-                    cluster.append(j)
-                    visited.add(j)
-            
-            if len(cluster) > 1:  
-                risk_score = 0.0
-                for idx in cluster:
-                    if logs[idx]['status'].lower() == 'failed':
-                        risk_score += 0.3
-                    if logs[idx]['location'] in self.risk_factors['location']:
-                        risk_score += self.risk_factors['location'][logs[idx]['location']]
-                    if logs[idx]['event_type'] in self.risk_factors['event_type']:
-                        risk_score += self.risk_factors['event_type'][logs[idx]['event_type']]
-                
-                risk_score = min(1.0, risk_score / len(cluster))
-                
-                clusters.append({
-                    'log_indices': cluster,
-                    'risk_score': float(risk_score),
-                    'source_ip': logs[cluster[0]]['source_ip'],
-                    'size': len(cluster)
-                })
+        for root in np.flatnonzero(sizes > 1):
+            cluster = members[starts[root]:starts[root] + sizes[root]].tolist()
+            clusters.append({
+                'log_indices': cluster,
+                'risk_score': float(min(1.0, risk[root] / sizes[root])),
+                'source_ip': logs.source_ip[cluster[0]],
+                'size': len(cluster)
+            })
         
         clusters.sort(key=lambda x: x['risk_score'], reverse=True)
         
         return clusters
 
     def _identify_attack_patterns(self, clusters: List[Dict[str, Any]], 
-                                  logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+                                  logs: ProcessedLogs) -> List[Dict[str, Any]]:
         attack_patterns = []
         
-        for cluster in clusters:
-            cluster_logs = [logs[i] for i in cluster['log_indices']]
+        login = self._event_index['login']
+        download = self._event_index['file_download']
+        lateral = self._event_index['lateral_movement']
+        
+        for cluster_id, cluster in enumerate(clusters):
+            cluster_indices = np.asarray(cluster['log_indices'])
+            events = logs.event_code[cluster_indices]
             
-            has_failed_login = any(log['event_type'] == 'login' and log['status'] == 'failed' 
-                                  for log in cluster_logs)
-            has_download = any(log['event_type'] == 'file_download' for log in cluster_logs)
-            has_lateral = any(log['event_type'] == 'lateral_movement' for log in cluster_logs)
+            has_failed_login = bool(np.any((events == login) & logs.failed_exact[cluster_indices]))
+            has_download = bool(np.any(events == download))
+            has_lateral = bool(np.any(events == lateral))
             
-            suspicious_process = any(
-                any(risk_proc in log['process'].lower() 
-                    for risk_proc in self.risk_factors['process']) 
-                for log in cluster_logs if log['process']
-            )
+            suspicious_process = bool(np.any(logs.process_code[cluster_indices] > 0))
             
             pattern_name = None
             severity = 0.0
@@ -378,7 +604,7 @@ class ACOLogAnalyzer:
                 attack_patterns.append({
                     'pattern_name': pattern_name,
                     'severity': severity,
-                    'cluster_id': clusters.index(cluster),
+                    'cluster_id': cluster_id,
                     'log_indices': cluster['log_indices']
                 })
         
@@ -387,8 +613,10 @@ class ACOLogAnalyzer:
         return attack_patterns
 
     def _extract_suspicious_logs(self, attractiveness: np.ndarray, 
-                                logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        indices = np.argsort(attractiveness)[::-1][:5]  
+                                logs: ProcessedLogs) -> List[Dict[str, Any]]:
+        top = min(5, attractiveness.shape[0])
+        indices = np.argpartition(-attractiveness, top - 1)[:top]
+        indices = indices[np.lexsort((indices, -attractiveness[indices]))]
         
         suspicious_logs = []
         for idx in indices:
@@ -396,12 +624,12 @@ class ACOLogAnalyzer:
                 suspicious_logs.append({
                     'index': int(idx),
                     'attractiveness': float(attractiveness[idx]),
-                    'source_ip': logs[idx]['source_ip'],
-                    'event_type': logs[idx]['event_type'],
-                    'destination_ip': logs[idx]['destination_ip'],
-                    'timestamp': logs[idx]['timestamp'],
-                    'location': logs[idx]['location'],
-                    'process': logs[idx]['process']
+                    'source_ip': logs.source_ip[idx],
+                    'event_type': logs.event_type[idx],
+                    'destination_ip': logs.destination_ip[idx],
+                    'timestamp': logs.timestamp[idx],
+                    'location': logs.location[idx],
+                    'process': logs.process[idx]
                 })
         
         return suspicious_logs
@@ -0,0 +1,81 @@
+import numpy as np
+import re
+import warnings
+from numba import njit
+from typing import List, Any, Tuple
+from datetime import datetime, timezone
+
+# ISO timestamps NumPy and datetime.fromisoformat read the same way. NumPy also accepts
+# 'today', bare years, signed or zero years and digit runs, which fromisoformat rejects
+_PLAIN_ISO_TIMESTAMP = re.compile(
+    r'(?!0000)[0-9]{4}-[0-9]{2}-[0-9]{2}(?:[T ][0-9]{2}:[0-9]{2}(?::[0-9]{2}(?:\.[0-9]{1,6})?)?)?Z?'
+)
+
+def parse_timestamps(timestamps: List[Any], utc: bool = False) -> np.ndarray:
+    """datetime64[us] per timestamp, NaT when missing or unparseable.
+
+    Timestamps with a UTC offset keep their wall-clock time, or are converted to UTC
+    when utc is set. NumPy parses the batch when every entry is a plain ISO string;
+    anything else goes through datetime.fromisoformat one entry at a time.
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            cleaned = []
+            for timestamp in timestamps:
+                if not timestamp:
+                    cleaned.append('NaT')
+                elif not _PLAIN_ISO_TIMESTAMP.fullmatch(timestamp):
+                    raise ValueError(timestamp)
+                else:
+                    cleaned.append(timestamp[:-1] if timestamp.endswith('Z') else timestamp)
+            return np.array(cleaned, dtype='datetime64[us]')
+    except (ValueError, TypeError, AttributeError, Warning):
+        pass
+
+    parsed = np.full(len(timestamps), np.datetime64('NaT'), dtype='datetime64[us]')
+    for i, timestamp in enumerate(timestamps):
+        if timestamp:
+            try:
+                if timestamp.endswith('Z'):
+                    timestamp = timestamp[:-1] + '+00:00'
+                value = datetime.fromisoformat(timestamp)
+            except (ValueError, TypeError, AttributeError):
+                continue
+            if utc and value.tzinfo is not None:
+                value = value.astimezone(timezone.utc)
+            parsed[i] = value.replace(tzinfo=None)
+    return parsed
+
+def byte_counts(values: List[Any]) -> np.ndarray:
+    """Byte counts as float64, raising TypeError on anything but numbers rather than letting
+    NumPy turn null into NaN or parse numeric strings"""
+    counts = np.array(values)
+    if counts.dtype.kind not in 'biuf':
+        for value in values:
+            if not isinstance(value, (int, float)):
+                raise TypeError(f"byte count must be a number, not {type(value).__name__}")
+    return counts.astype(np.float64)
+
+def external_ips(ips: List[Any], internal_prefixes: Tuple[str, ...]) -> np.ndarray:
+    """Present IPs starting with none of the internal prefixes; values that are not strings count as external"""
+    return np.fromiter(
+        (bool(ip) and not (isinstance(ip, str) and ip.startswith(internal_prefixes)) for ip in ips),
+        dtype=bool, count=len(ips)
+    )
+
+@njit(cache=True, fastmath=True, error_model='numpy')
+def moments_from_power_sums(n_logs: float, sum_1: float, sum_2: float, sum_3: float) -> Tuple[float, float]:
+    # Variance and skewness from the first three power sums of deviations from a shift.
+    # Summing deviations from one of the values (rather than the values themselves) keeps
+    # the central moments derived here from cancelling catastrophically
+    mean_deviation = sum_1 / n_logs
+    mean_square = sum_2 / n_logs
+    variance = max(0.0, mean_square - mean_deviation * mean_deviation)
+
+    skewness = 0.0
+    if n_logs > 2 and variance > 0:
+        third_moment = sum_3 / n_logs - 3.0 * mean_deviation * mean_square + 2.0 * mean_deviation ** 3
+        skewness = third_moment / variance ** 1.5
+
+    return variance, skewness
@@ -1,10 +1,191 @@
 import numpy as np
 import random
-from typing import Dict, List, Any, Tuple
+import re
+from numba import njit
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
-import math
+
+from common import byte_counts, external_ips, moments_from_power_sums, parse_timestamps
+
+# Attractor block size for the pairwise firefly update
+_TILE = 8
+
+# Source or destination IPs with these prefixes are internal
+_INTERNAL_PREFIXES = ('10.', '172.16.', '192.168.')
+
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _fitness_from_scores(scores: np.ndarray, feature_alignment: float) -> float:
+    n_logs = scores.shape[0]
+    if n_logs == 0:
+        return 0.0
+    
+    max_score = scores.max()
+    scale = 1.0 / max_score if max_score > 0 else 1.0
+    
+    # Power sums in a single pass, shifted by the first score
+    shift = scores[0] * scale
+    sum_1 = 0.0
+    sum_2 = 0.0
+    sum_3 = 0.0
+    high_count = 0
+    for i in range(n_logs):
+        score = scores[i] * scale
+        deviation = score - shift
+        sum_1 += deviation
+        sum_2 += deviation * deviation
+        sum_3 += deviation * deviation * deviation
+        if score > 0.7:
+            high_count += 1
+    
+    variance, skewness = moments_from_power_sums(n_logs, sum_1, sum_2, sum_3)
+    
+    high_ratio = high_count / n_logs
+    
+    ratio_quality = 0.0
+    if high_ratio > 0 and high_ratio <= 0.15:
+        ratio_quality = 1.0 - abs(0.07 - high_ratio) / 0.07
+    elif high_ratio > 0.15:
+        ratio_quality = max(0.0, 1.0 - (high_ratio - 0.15) * 5)
+    
+    return (
+        variance * 2.0 +                  # Separation in scores
+        max(0.0, skewness) * 1.5 +        # Positive skew
+        ratio_quality * 3.0 +             # Good alert ratio
+        feature_alignment * 2.5           # Critical feature alignment
+    )
+
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _population_fitness(features: np.ndarray, fireflies: np.ndarray, crit_mask: np.ndarray,
+                        scores: np.ndarray, brightness: np.ndarray) -> None:
+    n_logs, dims = features.shape
+    for f in range(fireflies.shape[0]):
+        for k in range(n_logs):
+            score = 0.0
+            for d in range(dims):
+                score += features[k, d] * fireflies[f, d]
+            scores[k] = score
+        
+        # Share of the firefly's weight that sits on the critical features
+        critical_weight_sum = 0.0
+        total_weight_sum = 0.0
+        for d in range(dims):
+            critical_weight_sum += fireflies[f, d] * crit_mask[d]
+            total_weight_sum += fireflies[f, d]
+        feature_alignment = critical_weight_sum / total_weight_sum if total_weight_sum > 0 else 0.0
+        
+        brightness[f] = _fitness_from_scores(scores, feature_alignment)
+
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _fa_loop(features: np.ndarray, fireflies: np.ndarray, alpha: float, alpha_decay: float,
+             beta0: float, gamma: float, crit_mask: np.ndarray,
+             rand_pool: np.ndarray) -> Tuple[np.ndarray, float, np.ndarray]:
+    n_fireflies, dims = fireflies.shape
+    max_iterations = rand_pool.shape[0]
+    scores = np.empty(features.shape[0])
+    brightness = np.empty(n_fireflies)
+    _population_fitness(features, fireflies, crit_mask, scores, brightness)
+    
+    best_idx = np.argmax(brightness)
+    best_position = fireflies[best_idx].copy()
+    best_fitness = brightness[best_idx]
+    
+    convergence = np.empty(max_iterations + 1)
+    convergence[0] = best_fitness
+    n_recorded = 1
+    stalled = 0
+    
+    # Positions ping-pong between two fixed buffers
+    spare = np.empty_like(fireflies)
+    for iteration in range(max_iterations):
+        noise = rand_pool[iteration]
+        spare[:] = fireflies
+        
+        # Firefly j moves towards every brighter firefly; ties go to the lower index.
+        # Attractors are visited in blocks of _TILE so their rows stay in L1 for all j
+        for i0 in range(0, n_fireflies, _TILE):
+            i1 = min(i0 + _TILE, n_fireflies)
+            for j in range(n_fireflies):
+                for i in range(i0, i1):
+                    if not (brightness[i] > brightness[j] or (brightness[i] == brightness[j] and i < j)):
+                        continue
+                    distance_sq = 0.0
+                    for d in range(dims):
+                        delta = fireflies[i, d] - fireflies[j, d]
+                        distance_sq += delta * delta
+                    beta = beta0 * np.exp(-gamma * distance_sq)
+                    for d in range(dims):
+                        spare[j, d] += beta * (fireflies[i, d] - fireflies[j, d]) + alpha * noise[i, j, d]
+        
+        for j in range(n_fireflies):
+            for d in range(dims):
+                spare[j, d] = min(max(spare[j, d], 0.0), 1.0)
+        
+        fireflies, spare = spare, fireflies
+        _population_fitness(features, fireflies, crit_mask, scores, brightness)
+        
+        current_best_idx = np.argmax(brightness)
+        if brightness[current_best_idx] > best_fitness:
+            best_position[:] = fireflies[current_best_idx]
+            best_fitness = brightness[current_best_idx]
+        
+        previous_best = convergence[iteration]
+        convergence[iteration + 1] = best_fitness
+        n_recorded = iteration + 2
+        
+        alpha *= alpha_decay
+        
+        if iteration > 10 and convergence[iteration + 1] - convergence[iteration - 8] < 0.001:
+            break
+        
+        # Stop once the best fitness has stalled for five consecutive iterations
+        if best_fitness - previous_best < 1e-4 * abs(previous_best):
+            stalled += 1
+            if stalled >= 5:
+                break
+        else:
+            stalled = 0
+    
+    return best_position, best_fitness, convergence[:n_recorded]
+
+def _time_detail(log: Dict[str, Any], parsed_timestamp: Optional[datetime]) -> str:
+    if parsed_timestamp is not None:
+        return f"Time: {parsed_timestamp.strftime('%H:%M:%S')}"
+    try:
+        timestamp = log.get('timestamp', '')
+        if timestamp.endswith('Z'):
+            timestamp = timestamp[:-1] + '+00:00'
+        dt = datetime.fromisoformat(timestamp)
+        return f"Time: {dt.strftime('%H:%M:%S')}"
+    except (ValueError, TypeError):
+        return "Time: unknown"
+
+def _port_detail(log: Dict[str, Any], parsed_timestamp: Optional[datetime]) -> str:
+    return f"Port: {log.get('destination_port', 'unknown')}"
+
+def _event_detail(log: Dict[str, Any], parsed_timestamp: Optional[datetime]) -> str:
+    return f"Event: {log.get('event_type', 'unknown')}"
 
 class FireflyLogAnalyzer:
+    # Detail formatter per feature column, called as fn(log, parsed_timestamp)
+    _DETAIL_FNS = (
+        lambda log, _: f"Source: {log.get('location', 'unknown')}",
+        _time_detail,
+        lambda log, _: f"Protocol: {log.get('protocol', 'unknown')}",
+        _port_detail,
+        _port_detail,
+        _port_detail,
+        lambda log, _: f"Process: {log.get('process_name', 'unknown')}",
+        lambda log, _: f"File: {log.get('filename', 'unknown')}",
+        _event_detail,
+        _event_detail,
+        _event_detail,
+        lambda log, _: f"Status: {log.get('status', 'unknown')}",
+        lambda log, _: f"Source IP: {log.get('source_ip', 'unknown')} → Dest IP: {log.get('destination_ip', 'unknown')}",
+        lambda log, _: f"Sent: {log.get('bytes_sent', 0)} bytes, Received: {log.get('bytes_received', 0)} bytes",
+        lambda log, _: f"Username: {log.get('username', 'unknown')}",
+        lambda log, _: f"Login failed for user: {log.get('username', 'unknown')}",
+    )
+    
     def __init__(self,
                  n_fireflies: int = 25,
                  max_iterations: int = 50,
@@ -21,6 +202,13 @@ class FireflyLogAnalyzer:
         
         self.dimensions = 16
         
+        self._rng = np.random.default_rng()
+        
+        # Location, critical ports, malicious process, critical events, failed status, auth risk
+        self._crit_idx = np.array([0, 3, 6, 8, 11, 15], dtype=np.intp)
+        self._crit_mask = np.zeros(self.dimensions, dtype=np.float32)
+        self._crit_mask[self._crit_idx] = 1.0
+        
         self.security_indicators = {
             'high_risk_locations': [
                 'North Korea', 'Russia', 'Iran', 'China', 'Syria',
@@ -56,6 +244,22 @@ class FireflyLogAnalyzer:
             
             'suspicious_hours': [0, 1, 2, 3, 4, 22, 23]  # Late night/early morning
         }
+        
+        self._high_risk_locations = frozenset(self.security_indicators['high_risk_locations'])
+        self._suspicious_protocols = frozenset(self.security_indicators['suspicious_protocols'])
+        self._suspicious_hours = np.array(self.security_indicators['suspicious_hours'], dtype=np.int8)
+        self._timestamps = np.empty(0, dtype='datetime64[us]')
+        self._privileged_users = frozenset(['admin', 'administrator', 'root', 'system', 'superuser'])
+        self._malicious_process_rx = re.compile('|'.join(map(re.escape, self.security_indicators['malicious_processes'])))
+        self._suspicious_file_rx = re.compile('|'.join(map(re.escape, self.security_indicators['suspicious_files'])))
+        
+        # Value -> feature column; higher tiers are inserted last so they win
+        self._port_columns = {}
+        for column, tier in ((5, 'medium'), (4, 'high'), (3, 'critical')):
+            self._port_columns.update(dict.fromkeys(self.security_indicators['suspicious_ports'][tier], column))
+        self._event_columns = {}
+        for column, tier in ((10, 'medium'), (9, 'high'), (8, 'critical')):
+            self._event_columns.update(dict.fromkeys(self.security_indicators['attack_events'][tier], column))
     
     def analyze(self, logs: List[Dict[str, Any]]) -> Dict[str, Any]:
         if not logs:
@@ -78,56 +282,24 @@ class FireflyLogAnalyzer:
                 "optimization_convergence": []
             }
         
-        fireflies = np.random.uniform(0, 1, (self.n_fireflies, self.dimensions))
-        
-        brightness = np.array([self._evaluate_fitness(pos, features) for pos in fireflies])
-        
-        best_idx = np.argmax(brightness)
-        best_position = fireflies[best_idx].copy()
-        best_fitness = brightness[best_idx]
+        fireflies = self._rng.random((self.n_fireflies, self.dimensions), dtype=np.float32)
         
-        convergence = [float(best_fitness)]
+        # One random step per (brighter, dimmer) pair for every iteration, drawn up front
+        rand_pool = self._rng.random((self.max_iterations, self.n_fireflies, self.n_fireflies, self.dimensions),
+                                     dtype=np.float32)
+        rand_pool -= 0.5
         
-        alpha = self.alpha
-        for iteration in range(self.max_iterations):
-            sorted_indices = np.argsort(-brightness)
-            fireflies = fireflies[sorted_indices]
-            brightness = brightness[sorted_indices]
-            
-            new_fireflies = np.copy(fireflies)
-            
-            for i in range(self.n_fireflies):
-                for j in range(i+1, self.n_fireflies):
-                    distance = np.linalg.norm(fireflies[i] - fireflies[j])
-                    
-                    beta = self.beta0 * math.exp(-self.gamma * distance**2)
-                    
-                    new_fireflies[j] += beta * (fireflies[i] - fireflies[j]) + \
-                                      alpha * (np.random.rand(self.dimensions) - 0.5)
-            
-            new_fireflies = np.clip(new_fireflies, 0, 1)
-            
-            new_brightness = np.array([self._evaluate_fitness(pos, features) for pos in new_fireflies])
-            
-            fireflies = new_fireflies
-            brightness = new_brightness
-            
-            current_best_idx = np.argmax(brightness)
-            if brightness[current_best_idx] > best_fitness:
-                best_position = fireflies[current_best_idx].copy()
-                best_fitness = brightness[current_best_idx]
-            
-            convergence.append(float(best_fitness))
-            
-            alpha *= self.alpha_decay
-            
-            if iteration > 10 and abs(convergence[-1] - convergence[-10]) < 0.001:
-                break
+        best_position, best_fitness, convergence = _fa_loop(
+            features, fireflies, self.alpha, self.alpha_decay, self.beta0, self.gamma,
+            self._crit_mask, rand_pool
+        )
         
         alert_scores = self._calculate_alert_scores(best_position, features)
         
         threshold = 0.65
         critical_indices = np.where(alert_scores > threshold)[0]
+        # Highest score first; the stable sort keeps log order among equal scores
+        critical_indices = critical_indices[np.argsort(-alert_scores[critical_indices], kind='stable')]
         critical_events = []
         
         for idx in critical_indices:
@@ -145,11 +317,10 @@ class FireflyLogAnalyzer:
                 "port": log.get('destination_port', ''),
                 "event_type": log.get('event_type', ''),
                 "status": log.get('status', ''),
-                "contributing_factors": self._describe_alert_factors(factor_scores, log)
+                "contributing_factors": self._describe_alert_factors(factor_scores, log,
+                                                                     self._timestamps[orig_idx].item())
             })
         
-        critical_events.sort(key=lambda x: x["alert_score"], reverse=True)
-        
         suspicious_patterns = self._identify_suspicious_patterns(logs, critical_events, best_position)
         
         overall_alert = self._calculate_overall_alert(alert_scores, critical_events, suspicious_patterns)
@@ -159,138 +330,67 @@ class FireflyLogAnalyzer:
             "alert_score": float(overall_alert),
             "critical_events": critical_events,
             "suspicious_patterns": suspicious_patterns,
-            "optimization_convergence": convergence
+            "optimization_convergence": convergence.tolist()
         }
     
     def _extract_features(self, logs: List[Dict[str, Any]]) -> Tuple[np.ndarray, List[int]]:
-        features = []
-        log_indices = []
+        n_logs = len(logs)
+        features = np.zeros((n_logs, self.dimensions), dtype=np.float32)
+        rows = np.arange(n_logs)
         
-        for i, log in enumerate(logs):
-            feature_vector = np.zeros(self.dimensions)
-            
-            location = log.get('location', '')
-            if location in self.security_indicators['high_risk_locations']:
-                feature_vector[0] = 1.0
-            
-            timestamp = log.get('timestamp', '')
-            if timestamp:
-                try:
-                    if timestamp.endswith('Z'):
-                        timestamp = timestamp[:-1] + '+00:00'
-                    dt = datetime.fromisoformat(timestamp)
-                    if dt.hour in self.security_indicators['suspicious_hours']:
-                        feature_vector[1] = 1.0
-                except (ValueError, TypeError):
-                    pass
-            
-            protocol = log.get('protocol', '')
-            if protocol in self.security_indicators['suspicious_protocols']:
-                feature_vector[2] = 1.0
-            
-            port = log.get('destination_port', 0)
-            if port in self.security_indicators['suspicious_ports']['critical']:
-                feature_vector[3] = 1.0
-            elif port in self.security_indicators['suspicious_ports']['high']:
-                feature_vector[4] = 1.0
-            elif port in self.security_indicators['suspicious_ports']['medium']:
-                feature_vector[5] = 1.0
-            
-            process = log.get('process_name', '').lower()
-            if any(mal_proc in process for mal_proc in self.security_indicators['malicious_processes']):
-                feature_vector[6] = 1.0
-            
-            filename = log.get('filename', '').lower()
-            if any(susp_file in filename for susp_file in self.security_indicators['suspicious_files']):
-                feature_vector[7] = 1.0
-            
-            event_type = log.get('event_type', '')
-            if event_type in self.security_indicators['attack_events']['critical']:
-                feature_vector[8] = 1.0
-            elif event_type in self.security_indicators['attack_events']['high']:
-                feature_vector[9] = 1.0
-            elif event_type in self.security_indicators['attack_events']['medium']:
-                feature_vector[10] = 1.0
-            
-            if log.get('status', '').lower() == 'failed':
-                feature_vector[11] = 1.0
-            
-            src_ip = log.get('source_ip', '')
-            dst_ip = log.get('destination_ip', '')
-            if (src_ip and not src_ip.startswith(('10.', '172.16.', '192.168.'))) or \
-               (dst_ip and not dst_ip.startswith(('10.', '172.16.', '192.168.'))):
-                feature_vector[12] = 1.0
-            
-            bytes_sent = log.get('bytes_sent', 0)
-            bytes_received = log.get('bytes_received', 0)
-            if bytes_sent > 1000000 or bytes_received > 5000000 or \
-               (bytes_received > 0 and bytes_sent / bytes_received > 10):
-                feature_vector[13] = 1.0
-            
-            username = log.get('username', '').lower()
-            if username in ['admin', 'administrator', 'root', 'system', 'superuser']:
-                feature_vector[14] = 1.0
-            
-            if event_type == 'login' and log.get('status', '').lower() == 'failed':
-                feature_vector[15] = 1.0
-            
-            if np.sum(feature_vector) > 0:
-                features.append(feature_vector)
-                log_indices.append(i)
+        features[:, 0] = [log.get('location', '') in self._high_risk_locations for log in logs]
         
-        return np.array(features), log_indices
-    
-    def _evaluate_fitness(self, position: np.ndarray, features: np.ndarray) -> float:
-        if features.shape[0] == 0:
-            return 0.0
+        # Parsed once; the timestamps are kept for the factor details
+        self._timestamps = parse_timestamps([log.get('timestamp', '') for log in logs])
+        hours = np.where(np.isnat(self._timestamps), -1,
+                         self._timestamps.astype('datetime64[h]').astype(np.int64) % 24)
+        features[:, 1] = np.isin(hours, self._suspicious_hours)
         
-        scores = np.dot(features, position)
+        features[:, 2] = [log.get('protocol', '') in self._suspicious_protocols for log in logs]
         
-        max_score = np.max(scores)
-        if max_score > 0:
-            scores = scores / max_score
+        port_columns = np.array([self._port_columns.get(log.get('destination_port', 0), -1) for log in logs], dtype=np.intp)
+        matched = port_columns >= 0
+        features[rows[matched], port_columns[matched]] = 1.0
         
-        mean = np.mean(scores)
-        variance = np.var(scores)
+        process_search = self._malicious_process_rx.search
+        features[:, 6] = [process_search(log.get('process_name', '').lower()) is not None for log in logs]
         
-        skewness = 0.0
-        if len(scores) > 2:
-            std = np.std(scores)
-            if std > 0:
-                skewness = np.mean(((scores - mean) / std) ** 3)
+        file_search = self._suspicious_file_rx.search
+        features[:, 7] = [file_search(log.get('filename', '').lower()) is not None for log in logs]
         
-        high_threshold = 0.7
-        high_count = np.sum(scores > high_threshold)
-        high_ratio = high_count / len(scores)
+        event_types = [log.get('event_type', '') for log in logs]
+        event_columns = np.array([self._event_columns.get(event_type, -1) for event_type in event_types], dtype=np.intp)
+        matched = event_columns >= 0
+        features[rows[matched], event_columns[matched]] = 1.0
         
-        ratio_quality = 0.0
-        if high_ratio > 0 and high_ratio <= 0.15:
-            ratio_quality = 1.0 - abs(0.07 - high_ratio) / 0.07
-        elif high_ratio > 0.15:
-            ratio_quality = max(0, 1.0 - (high_ratio - 0.15) * 5)
+        failed = np.array([log.get('status', '').lower() == 'failed' for log in logs], dtype=bool)
+        features[:, 11] = failed
         
-        critical_features = [0, 3, 6, 8, 11, 15]  # Location, critical ports, malicious process, critical events, failed status, auth risk
-        critical_weight_sum = sum(position[i] for i in critical_features)
-        total_weight_sum = sum(position)
+        features[:, 12] = (external_ips([log.get('source_ip', '') for log in logs], _INTERNAL_PREFIXES) |
+                           external_ips([log.get('destination_ip', '') for log in logs], _INTERNAL_PREFIXES))
         
-        feature_alignment = critical_weight_sum / total_weight_sum if total_weight_sum > 0 else 0
+        bytes_sent = byte_counts([log.get('bytes_sent', 0) for log in logs])
+        bytes_received = byte_counts([log.get('bytes_received', 0) for log in logs])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            unusual_ratio = (bytes_received > 0) & (bytes_sent / bytes_received > 10)
+        features[:, 13] = (bytes_sent > 1000000) | (bytes_received > 5000000) | unusual_ratio
         
-        fitness = (
-            variance * 2.0 +                  # Separation in scores
-            max(0, skewness) * 1.5 +          # Positive skew
-            ratio_quality * 3.0 +             # Good alert ratio
-            feature_alignment * 2.5           # Critical feature alignment
-        )
+        features[:, 14] = [log.get('username', '').lower() in self._privileged_users for log in logs]
+        
+        features[:, 15] = failed & np.array([event_type == 'login' for event_type in event_types], dtype=bool)
         
-        return fitness
+        keep = features.any(axis=1)
+        return np.asarray(features[keep], dtype=np.float32, order='C'), np.flatnonzero(keep).tolist()
+    
+    def _evaluate_fitness(self, fireflies: np.ndarray, features: np.ndarray) -> np.ndarray:
+        brightness = np.empty(fireflies.shape[0])
+        _population_fitness(features, fireflies, self._crit_mask, np.empty(features.shape[0]), brightness)
+        return brightness
     
     def _calculate_alert_scores(self, position: np.ndarray, features: np.ndarray) -> np.ndarray:
-        scores = np.dot(features, position)
-        
-        max_score = np.max(scores)
-        if max_score > 0:
-            scores = scores / max_score
-        
+        scores = features @ position
+        max_score = scores.max()
+        np.multiply(scores, 1.0 / (max_score if max_score > 0 else 1.0), out=scores)
         return scores
     
     def _get_factor_contributions(self, position: np.ndarray, feature_vector: np.ndarray) -> List[Tuple[int, float]]:
@@ -302,7 +402,8 @@ class FireflyLogAnalyzer:
         
         return contributions
     
-    def _describe_alert_factors(self, factor_scores: List[Tuple[int, float]], log: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _describe_alert_factors(self, factor_scores: List[Tuple[int, float]], log: Dict[str, Any],
+                                parsed_timestamp: Optional[datetime] = None) -> List[Dict[str, Any]]:
         factor_descriptions = [
             "High-risk location",
             "Suspicious time (non-business hours)",
@@ -325,7 +426,7 @@ class FireflyLogAnalyzer:
         factors = []
         for idx, score in factor_scores:
             if score > 0.01:  
-                detail = self._get_specific_factor_detail(idx, log)
+                detail = self._get_specific_factor_detail(idx, log, parsed_timestamp)
                 
                 factors.append({
                     "factor": factor_descriptions[idx],
@@ -335,42 +436,9 @@ class FireflyLogAnalyzer:
         
         return factors[:5]  
     
-    def _get_specific_factor_detail(self, factor_idx: int, log: Dict[str, Any]) -> str:
-        if factor_idx == 0:
-            return f"Source: {log.get('location', 'unknown')}"
-        elif factor_idx == 1:
-            try:
-                timestamp = log.get('timestamp', '')
-                if timestamp.endswith('Z'):
-                    timestamp = timestamp[:-1] + '+00:00'
-                dt = datetime.fromisoformat(timestamp)
-                return f"Time: {dt.strftime('%H:%M:%S')}"
-            except (ValueError, TypeError):
-                return "Time: unknown"
-        elif factor_idx == 2:
-            return f"Protocol: {log.get('protocol', 'unknown')}"
-        elif factor_idx in [3, 4, 5]:
-            return f"Port: {log.get('destination_port', 'unknown')}"
-        elif factor_idx == 6:
-            return f"Process: {log.get('process_name', 'unknown')}"
-        elif factor_idx == 7:
-            return f"File: {log.get('filename', 'unknown')}"
-        elif factor_idx in [8, 9, 10]:
-            return f"Event: {log.get('event_type', 'unknown')}"
-        elif factor_idx == 11:
-            return f"Status: {log.get('status', 'unknown')}"
-        elif factor_idx == 12:
-            return f"Source IP: {log.get('source_ip', 'unknown')} → Dest IP: {log.get('destination_ip', 'unknown')}"
-        elif factor_idx == 13:
-            sent = log.get('bytes_sent', 0)
-            received = log.get('bytes_received', 0)
-            return f"Sent: {sent} bytes, Received: {received} bytes"
-        elif factor_idx == 14:
-            return f"Username: {log.get('username', 'unknown')}"
-        elif factor_idx == 15:
-            return f"Login failed for user: {log.get('username', 'unknown')}"
-        else:
-            return ""
+    def _get_specific_factor_detail(self, factor_idx: int, log: Dict[str, Any],
+                                    parsed_timestamp: Optional[datetime] = None) -> str:
+        return self._DETAIL_FNS[factor_idx](log, parsed_timestamp)
     
     def _identify_suspicious_patterns(self, logs: List[Dict[str, Any]], 
                                     critical_events: List[Dict[str, Any]],
@@ -380,46 +448,41 @@ class FireflyLogAnalyzer:
         if len(critical_events) < 2:
             return patterns
         
-        critical_indices = [event['log_index'] for event in critical_events]
-        
-        brute_force = self._detect_brute_force(logs, critical_indices)
-        if brute_force:
-            patterns.append(brute_force)
-        
-        exfiltration = self._detect_data_exfiltration(logs, critical_indices)
-        if exfiltration:
-            patterns.append(exfiltration)
-        
-        lateral_movement = self._detect_lateral_movement(logs, critical_indices)
-        if lateral_movement:
-            patterns.append(lateral_movement)
-        
-        scanning = self._detect_scanning(logs, critical_indices)
-        if scanning:
-            patterns.append(scanning)
-            
-        privesc = self._detect_privilege_escalation(logs, critical_indices)
-        if privesc:
-            patterns.append(privesc)
+        # Route every critical log into its detector bucket in a single pass
+        brute_ip_groups = {}
+        large_transfers = []
+        lateral = []
+        port_scans = []
+        privesc = []
+        for event in critical_events:
+            idx = event['log_index']
+            log = logs[idx]
+            event_type = log.get('event_type')
+            if event_type == 'login':
+                src_ip = log.get('source_ip', '')
+                if src_ip and log.get('status', '').lower() == 'failed':
+                    brute_ip_groups.setdefault(src_ip, []).append((idx, log))
+            elif event_type == 'lateral_movement':
+                lateral.append((idx, log))
+            elif event_type == 'port_scan':
+                port_scans.append((idx, log))
+            elif event_type == 'privilege_escalation':
+                privesc.append((idx, log))
+            
+            if log.get('bytes_sent', 0) > 1000000:  # >1MB
+                large_transfers.append((idx, log))
+        
+        for pattern in (self._detect_brute_force(brute_ip_groups),
+                        self._detect_data_exfiltration(large_transfers),
+                        self._detect_lateral_movement(lateral),
+                        self._detect_scanning(port_scans),
+                        self._detect_privilege_escalation(privesc)):
+            if pattern:
+                patterns.append(pattern)
         
         return patterns
     
-    def _detect_brute_force(self, logs: List[Dict[str, Any]], 
-                           critical_indices: List[int]) -> Dict[str, Any]:
-        failed_logins = [(i, logs[i]) for i in critical_indices 
-                         if logs[i].get('event_type') == 'login' and 
-                         logs[i].get('status', '').lower() == 'failed']
-        
-        ip_groups = {}
-        for idx, log in failed_logins:
-            src_ip = log.get('source_ip', '')
-            if not src_ip:
-                continue
-                
-            if src_ip not in ip_groups:
-                ip_groups[src_ip] = []
-            ip_groups[src_ip].append((idx, log))
-        
+    def _detect_brute_force(self, ip_groups: Dict[str, List[Tuple[int, Dict[str, Any]]]]) -> Dict[str, Any]:
         for ip, events in ip_groups.items():
             if len(events) >= 3:  
                 return {
@@ -433,11 +496,7 @@ class FireflyLogAnalyzer:
         
         return None
     
-    def _detect_data_exfiltration(self, logs: List[Dict[str, Any]], 
-                                critical_indices: List[int]) -> Dict[str, Any]:
-        large_transfers = [(i, logs[i]) for i in critical_indices 
-                         if logs[i].get('bytes_sent', 0) > 1000000]  # >1MB
-        
+    def _detect_data_exfiltration(self, large_transfers: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
         if large_transfers:
             total_bytes = sum(log.get('bytes_sent', 0) for _, log in large_transfers)
             return {
@@ -451,11 +510,7 @@ class FireflyLogAnalyzer:
         
         return None
     
-    def _detect_lateral_movement(self, logs: List[Dict[str, Any]], 
-                               critical_indices: List[int]) -> Dict[str, Any]:
-        lateral = [(i, logs[i]) for i in critical_indices 
-                  if logs[i].get('event_type') == 'lateral_movement']
-        
+    def _detect_lateral_movement(self, lateral: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
         if lateral:
             ips = set()
             for _, log in lateral:
@@ -475,11 +530,7 @@ class FireflyLogAnalyzer:
         
         return None
     
-    def _detect_scanning(self, logs: List[Dict[str, Any]], 
-                       critical_indices: List[int]) -> Dict[str, Any]:
-        port_scans = [(i, logs[i]) for i in critical_indices 
-                     if logs[i].get('event_type') == 'port_scan']
-        
+    def _detect_scanning(self, port_scans: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
         if port_scans:
             src_ips = set(log.get('source_ip', '') for _, log in port_scans)
             return {
@@ -493,11 +544,7 @@ class FireflyLogAnalyzer:
         
         return None
     
-    def _detect_privilege_escalation(self, logs: List[Dict[str, Any]], 
-                                   critical_indices: List[int]) -> Dict[str, Any]:
-        privesc = [(i, logs[i]) for i in critical_indices 
-                  if logs[i].get('event_type') == 'privilege_escalation']
-        
+    def _detect_privilege_escalation(self, privesc: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
         if privesc:
             return {
                 "pattern_type": "privilege_escalation",
@@ -1,13 +1,208 @@
 import numpy as np
 import random
+import re
+from numba import njit, prange
 from typing import Dict, List, Any, Tuple
 from datetime import datetime
 
+from common import moments_from_power_sums
+
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _fitness_from_scores(scores: np.ndarray, counts: np.ndarray, max_score: float, weight_balance: float) -> float:
+    # scores[i] stands for counts[i] logs sharing one feature row
+    n_logs = counts.sum()
+    if n_logs == 0:
+        return 0.0
+    
+    # Scores are normalised by their maximum only through the moments: the variance
+    # scales by 1 / max^2, skew is scale-free and the excess threshold scales by max
+    scale = 1.0 / max_score if max_score > 0 else 1.0
+    excess_threshold = 0.7 / scale
+    
+    # Power sums in a single pass, shifted by the first score
+    shift = scores[0]
+    sum_1 = 0.0
+    sum_2 = 0.0
+    sum_3 = 0.0
+    excess_count = 0
+    for i in range(scores.shape[0]):
+        score = scores[i]
+        deviation = score - shift
+        count = counts[i]
+        sum_1 += count * deviation
+        sum_2 += count * deviation * deviation
+        sum_3 += count * deviation * deviation * deviation
+        if score > excess_threshold:
+            excess_count += count
+    
+    raw_variance, skew = moments_from_power_sums(n_logs, sum_1, sum_2, sum_3)
+    variance = raw_variance * scale * scale
+    
+    excess_ratio = excess_count / n_logs
+    excess_penalty = 1.0 - min(1.0, excess_ratio * 5)
+    
+    return (
+        variance * 1.0 +                # Separation between normal/anomalous
+        max(0.0, skew) * 0.5 +          # Positive skew is good
+        weight_balance * 0.8 +          # Appropriate feature weights
+        excess_penalty * 0.7            # Not too many anomalies
+    )
+
+@njit(cache=True, fastmath=True, error_model='numpy', parallel=True)
+def _school_fitness(features: np.ndarray, counts: np.ndarray, positions: np.ndarray, critical_mask: np.ndarray,
+                    scores: np.ndarray, fitness: np.ndarray) -> None:
+    n_logs, dims = features.shape
+    for fish in prange(positions.shape[0]):
+        fish_scores = scores[fish]
+        max_score = 0.0
+        for k in range(n_logs):
+            score = 0.0
+            for d in range(dims):
+                score += features[k, d] * positions[fish, d]
+            fish_scores[k] = score
+            max_score = max(max_score, score)  # Scores are non-negative, so 0 is a safe floor
+        
+        critical_weight_sum = 0.0
+        total_weight_sum = 0.0
+        for d in range(dims):
+            critical_weight_sum += positions[fish, d] * critical_mask[d]
+            total_weight_sum += positions[fish, d]
+        weight_balance = critical_weight_sum / total_weight_sum if total_weight_sum > 0 else 0.0
+        
+        fitness[fish] = _fitness_from_scores(fish_scores, counts, max_score, weight_balance)
+
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _individual_step(positions: np.ndarray, directions: np.ndarray, step_ind: np.float32,
+                     out: np.ndarray) -> None:
+    # Normalise each fish's direction, scale it and clip the moved position in one pass
+    school_size, dims = positions.shape
+    for i in range(school_size):
+        norm_sq = np.float32(0.0)
+        for d in range(dims):
+            norm_sq += directions[i, d] * directions[i, d]
+        scale = step_ind / np.sqrt(norm_sq) if norm_sq > 0 else step_ind
+        for d in range(dims):
+            out[i, d] = min(np.float32(1.0), max(np.float32(0.0), positions[i, d] + directions[i, d] * scale))
+
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _fss_run(positions: np.ndarray, weights: np.ndarray, features: np.ndarray, counts: np.ndarray, critical_mask: np.ndarray,
+             directions: np.ndarray, step_ind_init: float, step_ind_final: float,
+             step_vol_init: float, step_vol_final: float, step_col: float,
+             weight_scale: float) -> Tuple[np.ndarray, float, bool, np.ndarray, np.ndarray]:
+    iterations, school_size, dims = directions.shape
+    # Positions and weights stay float32; fitness values and step sizes are float64
+    zero = np.float32(0.0)
+    one = np.float32(1.0)
+    scores = np.empty((school_size, features.shape[0]), dtype=np.float32)
+    test_positions = np.empty((school_size, dims), dtype=np.float32)
+    barycenter = np.empty(dims, dtype=np.float32)
+    col_direction = np.empty(dims, dtype=np.float32)
+    weight_deltas = np.empty(school_size, dtype=np.float32)
+    current_fitness = np.empty(school_size)
+    new_fitness = np.empty(school_size)
+    fitness_values = np.zeros(school_size)
+    best_position = np.zeros(dims, dtype=np.float32)
+    best_fitness = 0.0
+    found_best = False
+    
+    for iteration in range(iterations):
+        progress = iteration / iterations
+        step_ind = np.float32(step_ind_init - progress * (step_ind_init - step_ind_final))
+        step_vol = np.float32(step_vol_init - progress * (step_vol_init - step_vol_final))
+        
+        # Every fish tries one random unit step; it moves only if that improves its fitness
+        _individual_step(positions, directions[iteration], step_ind, test_positions)  # Keep within bounds
+        
+        _school_fitness(features, counts, positions, critical_mask, scores, current_fitness)
+        _school_fitness(features, counts, test_positions, critical_mask, scores, new_fitness)
+        
+        # Fitness gain of every fish, measured against its pre-move state. Improved fish take
+        # their test row in place, after their gain-weighted displacement is accumulated
+        col_direction[:] = zero
+        for i in range(school_size):
+            if new_fitness[i] > current_fitness[i]:
+                fitness_values[i] = new_fitness[i]
+                weight_deltas[i] = np.float32(new_fitness[i] - current_fitness[i])
+                for d in range(dims):
+                    col_direction[d] += weight_deltas[i] * (test_positions[i, d] - positions[i, d])
+                positions[i] = test_positions[i]
+            else:
+                fitness_values[i] = current_fitness[i]
+                weight_deltas[i] = zero
+        
+        iteration_best = fitness_values.argmax()
+        if fitness_values[iteration_best] > best_fitness:
+            best_fitness = fitness_values[iteration_best]
+            best_position[:] = positions[iteration_best]
+            found_best = True
+        
+        weights = np.minimum(np.maximum(weights + weight_deltas, one), np.float32(weight_scale))  # Keep within range
+        
+        total_weight = weights.sum()
+        barycenter[:] = zero
+        for i in range(school_size):
+            for d in range(dims):
+                barycenter[d] += weights[i] * positions[i, d]
+        if total_weight > 0:
+            barycenter /= total_weight
+        else:
+            barycenter[:] = positions.sum(axis=0) / np.float32(school_size)
+        
+        delta_sum = weight_deltas.sum()
+        if delta_sum > 0:
+            col_direction /= delta_sum
+        else:
+            col_direction[:] = zero
+        
+        col_norm_sq = (col_direction * col_direction).sum()
+        if col_norm_sq > 0:
+            positions = np.minimum(np.maximum(positions + col_direction * np.float32(step_col / np.sqrt(col_norm_sq)), zero), one)
+        
+        prev_total_weight = total_weight - delta_sum
+        
+        # A school that gained weight spreads out from the barycenter, otherwise it contracts
+        volitive = positions - barycenter
+        signed_step = step_vol if total_weight > prev_total_weight else -step_vol
+        norms = np.sqrt((volitive * volitive).sum(axis=1))
+        # Fish sitting on the barycenter get a zero scale instead of a branch
+        scale = np.where(norms > 0, signed_step / np.maximum(norms, np.float32(1e-30)), zero)
+        positions += volitive * scale.reshape(school_size, 1)
+        
+        positions = np.minimum(np.maximum(positions, zero), one)
+    
+    return best_position, best_fitness, found_best, positions, fitness_values
+
+def _transfer_reasons(log: Dict[str, Any]) -> List[str]:
+    reasons = []
+    bytes_sent = log.get('bytes_sent', 0)
+    bytes_received = log.get('bytes_received', 0)
+    if bytes_sent > 100000:
+        reasons.append(f"Large outbound transfer: {bytes_sent} bytes")
+    if bytes_received > 1000000:
+        reasons.append(f"Large inbound transfer: {bytes_received} bytes")
+    return reasons
+
 class FSSLogAnalyzer:
+    # Reason formatter per feature column, called as fn(log); None for columns that give no reason
+    _REASON_FNS = (
+        lambda log: [f"High-risk location: {log.get('location', '')}"],
+        None,
+        lambda log: [f"High-risk port: {log.get('destination_port', '')}"],
+        lambda log: [f"Suspicious protocol: {log.get('protocol', '')}"],
+        lambda log: [f"Suspicious process: {log.get('process_name', '')}"],
+        lambda log: [f"Suspicious filename: {log.get('filename', '')}"],
+        lambda log: ["Failed operation"],
+        _transfer_reasons,
+        None,
+        None,
+        lambda log: [f"Sensitive action: {log.get('event_type', '')}"],
+        None,
+    )
+    
     def __init__(self, school_size: int = 30, iterations: int = 50, 
                  step_ind_init: float = 0.1, step_ind_final: float = 0.001,
                  step_vol_init: float = 0.1, step_vol_final: float = 0.01,
-                 step_col: float = 0.1, weight_scale: float = 10.0):
+                 step_col: float = 0.1, weight_scale: float = 10.0, cache_features: bool = False):
         self.school_size = school_size
         self.iterations = iterations
         self.step_ind_init = step_ind_init
@@ -16,9 +211,13 @@ class FSSLogAnalyzer:
         self.step_vol_final = step_vol_final
         self.step_col = step_col
         self.weight_scale = weight_scale
+        self._rng = np.random.default_rng()
         
         self.dimensions = 12  # Number of security features to consider
         
+        self._critical_mask = np.zeros(self.dimensions, dtype=np.float32)
+        self._critical_mask[[0, 2, 3, 4, 10]] = 1.0
+        
         self.security_indicators = {
             'high_risk_locations': [
                 'North Korea', 'Russia', 'Iran', 'China', 'Syria'
@@ -41,6 +240,21 @@ class FSSLogAnalyzer:
                 'worm', 'virus', 'ransom', 'backdoor'
             ]
         }
+        
+        self._high_risk_locations = frozenset(self.security_indicators['high_risk_locations'])
+        self._medium_risk_locations = frozenset(self.security_indicators['medium_risk_locations'])
+        self._high_risk_ports = frozenset(self.security_indicators['high_risk_ports'])
+        self._high_risk_protocols = frozenset(self.security_indicators['high_risk_protocols'])
+        self._sensitive_events = frozenset(['lateral_movement', 'data_exfiltration', 'privilege_escalation'])
+        self._suspicious_process_rx = re.compile('|'.join(map(re.escape, self.security_indicators['suspicious_processes'])))
+        self._suspicious_file_rx = re.compile('|'.join(map(re.escape, self.security_indicators['suspicious_file_patterns'])))
+        self._reason_columns = np.array([fn is not None for fn in self._REASON_FNS])
+        self._example_columns = np.zeros(self.dimensions, dtype=bool)  # Risk factors that cite example logs
+        self._example_columns[[0, 1, 2, 3, 4, 5, 6, 7, 10]] = True
+        # Opt-in reuse of the last list's features, for callers that append to one list between
+        # calls; the default extracts afresh so a reused or edited list is always read anew
+        self.cache_features = cache_features
+        self._feature_cache = None  # (logs, extracted length, first and last extracted log, extraction)
 
     def analyze(self, logs: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -61,7 +275,10 @@ class FSSLogAnalyzer:
                 "risk_factors": []
             }
             
-        features, log_indices = self._extract_features(logs)
+        if self.cache_features:
+            features, log_indices, indicators = self._cached_features(logs)
+        else:
+            features, log_indices, indicators = self._extract_features(logs)
         
         if features.size == 0:  # No valid features extracted
             return {
@@ -72,87 +289,22 @@ class FSSLogAnalyzer:
                 "risk_factors": []
             }
         
-        positions = np.random.uniform(0, 1, (self.school_size, self.dimensions))
-        weights = np.ones(self.school_size) * (self.weight_scale / 2)
-        best_position = None
-        best_fitness = 0
-        
-        for iteration in range(self.iterations):
-            progress = iteration / self.iterations
-            step_ind = self.step_ind_init - progress * (self.step_ind_init - self.step_ind_final)
-            step_vol = self.step_vol_init - progress * (self.step_vol_init - self.step_vol_final)
-            fitness_values = np.zeros(self.school_size)
-            new_positions = np.copy(positions)
-            
-            for i in range(self.school_size):
-                direction = np.random.uniform(-1, 1, self.dimensions)
-                direction = direction / np.linalg.norm(direction) if np.linalg.norm(direction) > 0 else direction
-                
-                test_position = positions[i] + direction * step_ind
-                test_position = np.clip(test_position, 0, 1)  # Keep within bounds
-                
-                current_fitness = self._evaluate_fitness(positions[i], features)
-                new_fitness = self._evaluate_fitness(test_position, features)
-                
-                if new_fitness > current_fitness:
-                    new_positions[i] = test_position
-                    fitness_values[i] = new_fitness
-                else:
-                    fitness_values[i] = current_fitness
-                
-                if fitness_values[i] > best_fitness:
-                    best_fitness = fitness_values[i]
-                    best_position = np.copy(new_positions[i])
-            
-            positions = new_positions
- 
-            weight_deltas = np.zeros(self.school_size)
-            for i in range(self.school_size):
-                prev_fitness = self._evaluate_fitness(positions[i], features)
-                new_fitness = fitness_values[i]
-                weight_deltas[i] = new_fitness - prev_fitness
-            
-            weights = weights + weight_deltas
-            weights = np.clip(weights, 1.0, self.weight_scale)  # Keep within range
-            
-            total_weight = np.sum(weights)
-            if total_weight > 0:
-                weighted_positions = positions * weights[:, np.newaxis]
-                barycenter = np.sum(weighted_positions, axis=0) / total_weight
-            else:
-                barycenter = np.mean(positions, axis=0)
-
-            if np.sum(weight_deltas) > 0:
-                col_direction = np.sum(
-                    (new_positions - positions) * weight_deltas[:, np.newaxis], axis=0
-                ) / np.sum(weight_deltas)
-            else:
-                col_direction = np.zeros(self.dimensions)
-            
-            if np.linalg.norm(col_direction) > 0:
-                col_direction = col_direction / np.linalg.norm(col_direction)
-                positions = positions + col_direction * self.step_col
-                positions = np.clip(positions, 0, 1)  # Keep within bounds
-            
-            total_weight = np.sum(weights)
-            prev_total_weight = total_weight - np.sum(weight_deltas)
-            
-            if total_weight > prev_total_weight:
-                for i in range(self.school_size):
-                    direction = positions[i] - barycenter
-                    if np.linalg.norm(direction) > 0:
-                        direction = direction / np.linalg.norm(direction)
-                        positions[i] = positions[i] + direction * step_vol
-            else:
-                for i in range(self.school_size):
-                    direction = barycenter - positions[i]
-                    if np.linalg.norm(direction) > 0:
-                        direction = direction / np.linalg.norm(direction)
-                        positions[i] = positions[i] + direction * step_vol
-            
-            positions = np.clip(positions, 0, 1)
+        positions = self._rng.random((self.school_size, self.dimensions), dtype=np.float32)
+        weights = np.full(self.school_size, self.weight_scale / 2, dtype=np.float32)
+        # Every iteration's individual-movement directions in one bulk draw, uniform in [-1, 1)
+        directions = self._rng.random((self.iterations, self.school_size, self.dimensions), dtype=np.float32)
+        directions *= 2
+        directions -= 1
+        
+        # The search only sees each distinct feature row once, weighted by how many logs share it
+        distinct_features, counts = self._distinct_rows(features)
+        best_position, best_fitness, found_best, positions, fitness_values = _fss_run(
+            positions, weights, distinct_features, counts, self._critical_mask, directions,
+            self.step_ind_init, self.step_ind_final, self.step_vol_init, self.step_vol_final,
+            self.step_col, self.weight_scale
+        )
         
-        if best_position is None:
+        if not found_best:
             best_idx = np.argmax(fitness_values)
             best_position = positions[best_idx]
             best_fitness = fitness_values[best_idx]
@@ -161,12 +313,12 @@ class FSSLogAnalyzer:
         
         priority_threshold = 0.6
         priority_indices = np.where(anomaly_scores > priority_threshold)[0]
+        priority_log_indices = np.asarray(log_indices, dtype=np.intp)[priority_indices]
+        priority_reasons = self._determine_anomaly_reasons(logs, priority_log_indices, indicators, best_position)
         priority_events = []
         
-        for idx in priority_indices:
-            log_index = log_indices[idx]
+        for idx, log_index, reasons in zip(priority_indices, priority_log_indices, priority_reasons):
             log = logs[log_index]
-            reasons = self._determine_anomaly_reasons(log, best_position)
             
             priority_events.append({
                 "log_index": int(log_index),
@@ -197,7 +349,7 @@ class FSSLogAnalyzer:
         overall_anomaly_score = 0.5 * max_anomaly + 0.3 * perc_anomalous + 0.2 * best_fitness
         overall_anomaly_score = min(1.0, overall_anomaly_score)
         
-        risk_factors = self._extract_risk_factors(logs, best_position)
+        risk_factors = self._extract_risk_factors(indicators, best_position)
         
         return {
             "algorithm": "fss",
@@ -207,155 +359,132 @@ class FSSLogAnalyzer:
             "risk_factors": risk_factors
         }
 
-    def _extract_features(self, logs: List[Dict[str, Any]]) -> Tuple[np.ndarray, List[int]]:
+    def _extract_features(self, logs: List[Dict[str, Any]]) -> Tuple[np.ndarray, List[int], np.ndarray]:
         """Extract features from logs for FSS analysis"""
-        features = []
+        # Indicator flags of every log, returned for the reason and risk-factor passes
+        indicators = np.zeros((len(logs), self.dimensions), dtype=bool)
         log_indices = []
+        process_search = self._suspicious_process_rx.search
+        file_search = self._suspicious_file_rx.search
         
         for i, log in enumerate(logs):
-            if not log.get('source_ip') and not log.get('event_type'):
-                continue
-                
-            feature_vector = np.zeros(self.dimensions)
+            feature_vector = indicators[i]
             
             location = log.get('location', '')
-            if location in self.security_indicators['high_risk_locations']:
-                feature_vector[0] = 1.0
+            if location in self._high_risk_locations:
+                feature_vector[0] = True
             
-            elif location in self.security_indicators['medium_risk_locations']:
-                feature_vector[1] = 1.0
+            elif location in self._medium_risk_locations:
+                feature_vector[1] = True
             
-            port = log.get('destination_port', 0)
-            if port in self.security_indicators['high_risk_ports']:
-                feature_vector[2] = 1.0
+            if log.get('destination_port', 0) in self._high_risk_ports:
+                feature_vector[2] = True
             
-            protocol = log.get('protocol', '')
-            if protocol in self.security_indicators['high_risk_protocols']:
-                feature_vector[3] = 1.0
+            if log.get('protocol', '') in self._high_risk_protocols:
+                feature_vector[3] = True
             
-            process = log.get('process_name', '').lower()
-            if any(susp in process for susp in self.security_indicators['suspicious_processes']):
-                feature_vector[4] = 1.0
+            if process_search(log.get('process_name', '').lower()):
+                feature_vector[4] = True
             
-            filename = log.get('filename', '').lower()
-            if any(pattern in filename for pattern in self.security_indicators['suspicious_file_patterns']):
-                feature_vector[5] = 1.0
+            if file_search(log.get('filename', '').lower()):
+                feature_vector[5] = True
             
             if log.get('status', '').lower() == 'failed':
-                feature_vector[6] = 1.0
+                feature_vector[6] = True
             
             bytes_sent = log.get('bytes_sent', 0)
             bytes_received = log.get('bytes_received', 0)
             if bytes_sent > 100000 or bytes_received > 1000000:
-                feature_vector[7] = 1.0
+                feature_vector[7] = True
             
             if log.get('event_type') == 'login' and log.get('status', '').lower() == 'failed':
-                feature_vector[8] = 1.0
-
-            feature_vector[9] = 0.0  
+                feature_vector[8] = True
             
-            if log.get('event_type') in ['lateral_movement', 'data_exfiltration', 'privilege_escalation']:
-                feature_vector[10] = 1.0
+            if log.get('event_type') in self._sensitive_events:
+                feature_vector[10] = True
             
             src_ip = log.get('source_ip', '')
             dst_ip = log.get('destination_ip', '')
             if (src_ip.startswith('192.168.') and not dst_ip.startswith('192.168.')) or \
                (src_ip.startswith('10.') and not dst_ip.startswith('10.')):
-                feature_vector[11] = 1.0
+                feature_vector[11] = True
             
-            features.append(feature_vector)
-            log_indices.append(i)
+            if log.get('source_ip') or log.get('event_type'):
+                log_indices.append(i)
         
-        return np.array(features), log_indices
+        return indicators[log_indices].astype(np.float32), log_indices, indicators
 
-    def _evaluate_fitness(self, position: np.ndarray, features: np.ndarray) -> float:
+    def _cached_features(self, logs: List[Dict[str, Any]]) -> Tuple[np.ndarray, List[int], np.ndarray]:
+        """Features of logs, reusing the last extraction for the same list and extracting only appended logs"""
+        # The same list still holding the same first and last extracted log dicts is taken as
+        # unchanged up to there; a list refilled in place fails that check. Logs edited in
+        # place without being replaced are not detected
+        if self._feature_cache is not None:
+            cached_logs, n_cached, first_log, last_log, (features, log_indices, indicators) = self._feature_cache
+            if (cached_logs is logs and n_cached <= len(logs)
+                    and logs[0] is first_log and logs[n_cached - 1] is last_log):
+                if n_cached == len(logs):
+                    return features, log_indices, indicators
+                tail_features, tail_indices, tail_indicators = self._extract_features(logs[n_cached:])
+                features = np.concatenate((features, tail_features))
+                log_indices = log_indices + [n_cached + i for i in tail_indices]
+                indicators = np.concatenate((indicators, tail_indicators))
+                self._feature_cache = (logs, len(logs), logs[0], logs[-1], (features, log_indices, indicators))
+                return features, log_indices, indicators
+        
+        extraction = self._extract_features(logs)
+        self._feature_cache = (logs, len(logs), logs[0], logs[-1], extraction)
+        return extraction
+
+    def _distinct_rows(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Collapse the binary feature matrix to its distinct rows and their log counts"""
+        bits = np.arange(self.dimensions)
+        codes = (features > 0) @ (1 << bits)
+        counts = np.bincount(codes, minlength=1 << self.dimensions)
+        present = np.flatnonzero(counts)
+        rows = ((present[:, None] >> bits) & 1).astype(np.float32)
+        return rows, counts[present]
+
+    def _evaluate_fitness_batch(self, positions: np.ndarray, features: np.ndarray) -> np.ndarray:
+        """Fitness of every fish at once"""
+        fitness = np.zeros(positions.shape[0])
         if features.shape[0] == 0:
-            return 0.0
-            
-        anomaly_scores = np.dot(features, position)
-        
-        if np.max(anomaly_scores) > 0:
-            anomaly_scores = anomaly_scores / np.max(anomaly_scores)
-        
-        variance = np.var(anomaly_scores)
-        
-        skew = 0.0
-        if len(anomaly_scores) > 2:
-            mean = np.mean(anomaly_scores)
-            std = np.std(anomaly_scores)
-            if std > 0:
-                skew = np.mean(((anomaly_scores - mean) / std) ** 3)
-        
-        critical_features = [0, 2, 3, 4, 10]  
-        critical_weight_sum = sum(position[i] for i in critical_features)
-        weight_balance = critical_weight_sum / sum(position) if sum(position) > 0 else 0
-        
-        threshold = 0.7
-        excess_ratio = np.mean(anomaly_scores > threshold)
-        excess_penalty = 1.0 - min(1.0, excess_ratio * 5)  
-        
-        fitness = (
-            variance * 1.0 +                # Separation between normal/anomalous
-            max(0, skew) * 0.5 +            # Positive skew is good
-            weight_balance * 0.8 +          # Appropriate feature weights
-            excess_penalty * 0.7            # Not too many anomalies
-        )
-        
+            return fitness
+        
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        if np.all((features == 0) | (features == 1)):
+            # Indicator features collapse to at most 2^dimensions rows, so the score scratch
+            # stays bounded however many logs are scored
+            features, counts = self._distinct_rows(features)
+        else:
+            counts = np.ones(features.shape[0], dtype=np.int64)
+        
+        scores = np.empty((positions.shape[0], features.shape[0]), dtype=np.float32)
+        _school_fitness(features, counts, np.ascontiguousarray(positions, dtype=np.float32),
+                        self._critical_mask, scores, fitness)
         return fitness
 
     def _calculate_anomaly_scores(self, position: np.ndarray, features: np.ndarray) -> np.ndarray:
-        scores = np.dot(features, position)
-        
-        if np.max(scores) > 0:
-            scores = scores / np.max(scores)
-        
+        # Matching contiguous float32 operands keep the matvec on the BLAS sgemv path
+        scores = features @ np.ascontiguousarray(position, dtype=features.dtype)
+        max_score = scores.max()
+        if max_score > 0:
+            np.divide(scores, max_score, out=scores)
         return scores
 
-    def _determine_anomaly_reasons(self, log: Dict[str, Any], position: np.ndarray) -> List[str]:
-        reasons = []
-        
+    def _determine_anomaly_reasons(self, logs: List[Dict[str, Any]], log_indices: np.ndarray,
+                                   indicators: np.ndarray, position: np.ndarray) -> List[List[str]]:
+        """Reasons for every listed log, from the set bits of its indicator row"""
         feature_threshold = 0.5  # Only consider features with weights above threshold
         
-        if position[0] > feature_threshold and log.get('location', '') in self.security_indicators['high_risk_locations']:
-            reasons.append(f"High-risk location: {log.get('location', '')}")
-        
-        if position[2] > feature_threshold and log.get('destination_port', 0) in self.security_indicators['high_risk_ports']:
-            reasons.append(f"High-risk port: {log.get('destination_port', '')}")
-        
-        if position[3] > feature_threshold and log.get('protocol', '') in self.security_indicators['high_risk_protocols']:
-            reasons.append(f"Suspicious protocol: {log.get('protocol', '')}")
-        
-        if position[4] > feature_threshold:
-            process = log.get('process_name', '').lower()
-            for susp in self.security_indicators['suspicious_processes']:
-                if susp in process:
-                    reasons.append(f"Suspicious process: {log.get('process_name', '')}")
-                    break
-        
-        if position[5] > feature_threshold:
-            filename = log.get('filename', '').lower()
-            for pattern in self.security_indicators['suspicious_file_patterns']:
-                if pattern in filename:
-                    reasons.append(f"Suspicious filename: {log.get('filename', '')}")
-                    break
-        
-        if position[6] > feature_threshold and log.get('status', '').lower() == 'failed':
-            reasons.append("Failed operation")
-        
-        if position[7] > feature_threshold:
-            bytes_sent = log.get('bytes_sent', 0)
-            bytes_received = log.get('bytes_received', 0)
-            if bytes_sent > 100000:
-                reasons.append(f"Large outbound transfer: {bytes_sent} bytes")
-            if bytes_received > 1000000:
-                reasons.append(f"Large inbound transfer: {bytes_received} bytes")
-        
-        if position[10] > feature_threshold and log.get('event_type') in ['lateral_movement', 'data_exfiltration', 'privilege_escalation']:
-            reasons.append(f"Sensitive action: {log.get('event_type', '')}")
+        active = indicators[log_indices] & ((position > feature_threshold) & self._reason_columns)
+        reasons = [[] for _ in range(len(log_indices))]
+        for event, idx in zip(*np.nonzero(active)):  # Row-major, so each log's reasons stay in column order
+            reasons[event].extend(self._REASON_FNS[idx](logs[log_indices[event]]))
         
         return reasons
 
-    def _extract_risk_factors(self, logs: List[Dict[str, Any]], position: np.ndarray) -> List[Dict[str, Any]]:
+    def _extract_risk_factors(self, indicators: np.ndarray, position: np.ndarray) -> List[Dict[str, Any]]:
         risk_factors = []
         
         feature_names = [
@@ -365,46 +494,21 @@ class FSSLogAnalyzer:
             "Unusual Time", "Sensitive Action", "Unusual Connection"
         ]
         
-        top_indices = np.argsort(position)[::-1][:5]  # Top 5 features
+        top = min(5, position.shape[0])  # Top 5 features
+        top_indices = np.argpartition(-position, top - 1)[:top]
+        top_indices = top_indices[np.lexsort((top_indices, -position[top_indices]))]
+        top_indices = top_indices[position[top_indices] > 0.3]
         
         for idx in top_indices:
-            if position[idx] > 0.3:  
-                example_logs = []
-                
-                for i, log in enumerate(logs):
-                    if idx == 0 and log.get('location', '') in self.security_indicators['high_risk_locations']:
-                        example_logs.append(i)
-                    elif idx == 1 and log.get('location', '') in self.security_indicators['medium_risk_locations']:
-                        example_logs.append(i)
-                    elif idx == 2 and log.get('destination_port', 0) in self.security_indicators['high_risk_ports']:
-                        example_logs.append(i)
-                    elif idx == 3 and log.get('protocol', '') in self.security_indicators['high_risk_protocols']:
-                        example_logs.append(i)
-                    elif idx == 4:
-                        process = log.get('process_name', '').lower()
-                        if any(susp in process for susp in self.security_indicators['suspicious_processes']):
-                            example_logs.append(i)
-                    elif idx == 5:
-                        filename = log.get('filename', '').lower()
-                        if any(pattern in filename for pattern in self.security_indicators['suspicious_file_patterns']):
-                            example_logs.append(i)
-                    elif idx == 6 and log.get('status', '').lower() == 'failed':
-                        example_logs.append(i)
-                    elif idx == 7:
-                        bytes_sent = log.get('bytes_sent', 0)
-                        bytes_received = log.get('bytes_received', 0)
-                        if bytes_sent > 100000 or bytes_received > 1000000:
-                            example_logs.append(i)
-                    elif idx == 10 and log.get('event_type') in ['lateral_movement', 'data_exfiltration', 'privilege_escalation']:
-                        example_logs.append(i)
-                
-                example_logs = example_logs[:3]
-                
-                risk_factors.append({
-                    "factor": feature_names[idx],
-                    "weight": float(position[idx]),
-                    "example_logs": example_logs
-                })
+            example_logs = []
+            if self._example_columns[idx]:
+                example_logs = np.flatnonzero(indicators[:, idx])[:3].tolist()
+            
+            risk_factors.append({
+                "factor": feature_names[idx],
+                "weight": float(position[idx]),
+                "example_logs": example_logs
+            })
         
         return risk_factors
 
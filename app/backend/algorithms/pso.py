@@ -1,8 +1,102 @@
 import numpy as np
-from typing import Dict, List, Any, Tuple
+import re
+from numba import njit, prange
+from typing import Dict, List, Any, NamedTuple, Tuple
 from datetime import datetime, timedelta
 import random
 
+from common import byte_counts, external_ips, moments_from_power_sums, parse_timestamps
+
+# Source or destination IPs with these prefixes are internal
+_INTERNAL_PREFIXES = ('192.168.', '10.')
+
+class LogColumns(NamedTuple):
+    """Column-wise view of the logs, read once per analysis"""
+    timestamp: List[Any]
+    source_ip: List[Any]
+    destination_ip: List[Any]
+    destination_port: np.ndarray
+    protocol: List[Any]
+    location: List[Any]
+    process_name: List[str]
+    filename: List[str]
+    event_type: List[Any]
+    status: List[str]
+    bytes_sent: np.ndarray
+    bytes_received: np.ndarray
+
+# The swarm kernel works on feature rows and weights zero-padded from 15 to 16
+# float32 values: each row is one 64-byte cache line, and the dot product maps
+# onto whole SIMD registers with no remainder loop
+_PADDED_DIMENSIONS = 16
+
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _fitness_from_scores(scores: np.ndarray, counts: np.ndarray, max_score: float) -> Tuple[float, float, float, float]:
+    # scores[i] stands for counts[i] logs sharing one feature row
+    n_logs = counts.sum()
+    
+    # Scores are normalised by their maximum only through the moments: the variance
+    # scales by 1 / max^2, skew is scale-free and the thresholds scale by max
+    scale = 1.0 / max_score if max_score > 0 else 1.0
+    high_threshold = 0.7 / scale
+    medium_threshold = 0.4 / scale
+    
+    # Power sums in a single pass, shifted by the first score
+    shift = scores[0]
+    sum_1 = 0.0
+    sum_2 = 0.0
+    sum_3 = 0.0
+    high_count = 0
+    medium_count = 0
+    for i in range(scores.shape[0]):
+        score = scores[i]
+        deviation = score - shift
+        count = counts[i]
+        sum_1 += count * deviation
+        sum_2 += count * deviation * deviation
+        sum_3 += count * deviation * deviation * deviation
+        if score > high_threshold:
+            high_count += count
+        elif score > medium_threshold:
+            medium_count += count
+    
+    raw_variance, skewness = moments_from_power_sums(n_logs, sum_1, sum_2, sum_3)
+    
+    return raw_variance * scale * scale, skewness, high_count / n_logs, medium_count / n_logs
+
+@njit(cache=True, fastmath=True, error_model='numpy', parallel=True)
+def _swarm_fitness(features: np.ndarray, counts: np.ndarray, weights: np.ndarray, positions: np.ndarray,
+                   scores: np.ndarray, fitness: np.ndarray) -> None:
+    # features and weights are padded to _PADDED_DIMENSIONS columns, positions are not
+    n_rows, dims = features.shape
+    for particle in prange(positions.shape[0]):
+        particle_scores = scores[particle]
+        particle_weights = weights[particle]
+        max_score = np.float32(0.0)
+        for k in range(n_rows):
+            score = np.float32(0.0)  # A float32 accumulator keeps the dot product in single-precision lanes
+            for d in range(dims):
+                score += features[k, d] * particle_weights[d]
+            particle_scores[k] = score
+            max_score = max(max_score, score)  # Scores are non-negative, so 0 is a safe floor
+        
+        variance, skewness, high_risk_ratio, medium_risk_ratio = _fitness_from_scores(particle_scores, counts, max_score)
+        
+        threshold_quality = (1 - min(high_risk_ratio * 10, 1.0)) * 0.6 + medium_risk_ratio * 0.4
+        
+        feature_utilization = np.std(positions[particle]) * -1 + 0.5
+        
+        key_feature_alignment = (positions[particle, 0] + positions[particle, 3] +
+                                 positions[particle, 7] + positions[particle, 9]) / 4
+        
+        fitness[particle] = (
+            variance * 2.0 +                  # Reward separation between events
+            max(0.0, skewness) * 1.0 +        # Reward positive skew
+            threshold_quality * 3.0 +         # Reward good threshold properties
+            feature_utilization * 1.0 +       # Reward balanced feature usage
+            key_feature_alignment * 2.0       # Reward security-aligned weights
+        )
+
 class PSOLogAnalyzer:
     def __init__(self, 
                  n_particles: int = 30, 
@@ -10,7 +104,8 @@ class PSOLogAnalyzer:
                  w_init: float = 0.9, 
                  w_final: float = 0.4,
                  c1: float = 2.0, 
-                 c2: float = 2.0):
+                 c2: float = 2.0,
+                 n_restarts: int = 1):
 
         self.n_particles = n_particles
         self.max_iterations = max_iterations
@@ -18,6 +113,9 @@ class PSOLogAnalyzer:
         self.w_final = w_final
         self.c1 = c1
         self.c2 = c2
+        self.n_restarts = max(1, n_restarts)
+        self.max_findings = 100
+        self._rng = np.random.default_rng()
         
         self.dimensions = 15
         
@@ -49,6 +147,18 @@ class PSOLogAnalyzer:
                 'privilege_escalation', 'brute_force'
             ]
         }
+        
+        self._malicious_process_rx = re.compile('|'.join(map(re.escape, self.security_patterns['malicious_processes'])))
+        self._suspicious_file_rx = re.compile('|'.join(map(re.escape, self.security_patterns['suspicious_files'])))
+        
+        # Port -> risk bucket: 0 none, 1 very high, 2 high, 3 medium
+        self._port_buckets = np.zeros(65536, dtype=np.int8)
+        for bucket, tier in ((3, 'medium'), (2, 'high'), (1, 'very_high')):  # Higher tiers written last win
+            self._port_buckets[self.security_patterns['suspicious_ports'][tier]] = bucket
+        
+        # Feature columns that make up a log's trend risk, flagged for every log by _extract_features
+        self._trend_columns = np.array([0, 3, 4, 9, 10])
+        self._trend_flags = np.zeros((0, self._trend_columns.size), dtype=bool)
 
     def analyze(self, logs: List[Dict[str, Any]]) -> Dict[str, Any]:
         if not logs:
@@ -60,7 +170,8 @@ class PSOLogAnalyzer:
                 "optimization_path": []
             }
         
-        features, log_mapping = self._extract_features(logs)
+        columns = self._log_columns(logs)
+        features, log_mapping = self._extract_features(columns)
         
         if len(features) == 0:
             return {
@@ -71,60 +182,107 @@ class PSOLogAnalyzer:
                 "optimization_path": []
             }
             
-        positions = np.random.uniform(0, 1, (self.n_particles, self.dimensions))
-        velocities = np.random.uniform(-0.1, 0.1, (self.n_particles, self.dimensions))
+        # Independent restarts are stacked as extra swarms so one kernel call scores every particle
+        # of every swarm. Swarm state stays float32 to match the features, and so do the random draws
+        n_swarms = self.n_restarts
+        positions = self._rng.random((n_swarms, self.n_particles, self.dimensions), dtype=np.float32)
+        velocities = self._rng.random((n_swarms, self.n_particles, self.dimensions), dtype=np.float32)
+        velocities *= 0.2
+        velocities -= 0.1
+        
+        # Every iteration's r1, r2 per particle in one bulk draw
+        coefficients = self._rng.random((self.max_iterations, n_swarms, self.n_particles, 2), dtype=np.float32)
+        
+        # The swarm only scores each distinct feature row once, weighted by how many logs share it
+        distinct_features, counts, row_of_log = self._distinct_rows(features)
+        
+        # Each particle's latest per-row scores, written by the kernel, and a copy of the rows behind
+        # every swarm's global best, so the final risk scores need no second pass over the features
+        row_scores = np.empty((n_swarms, self.n_particles, distinct_features.shape[0]), dtype=np.float32)
         
         personal_best_positions = np.copy(positions)
-        personal_best_scores = np.array([self._evaluate_fitness(pos, features) for pos in positions])
+        personal_best_scores = self._evaluate_fitness_batch(
+            positions.reshape(-1, self.dimensions), distinct_features, counts,
+            row_scores.reshape(-1, distinct_features.shape[0])
+        ).reshape(n_swarms, self.n_particles)
         
-        global_best_idx = np.argmax(personal_best_scores)
-        global_best_position = np.copy(personal_best_positions[global_best_idx])
-        global_best_score = personal_best_scores[global_best_idx]
+        swarms = np.arange(n_swarms)
+        best_idx = np.argmax(personal_best_scores, axis=1)
+        global_best_positions = personal_best_positions[swarms, best_idx]  # Fancy indexing copies
+        global_best_scores = personal_best_scores[swarms, best_idx]
+        global_best_row_scores = row_scores[swarms, best_idx]
         
-        optimization_path = [float(global_best_score)]
+        optimization_paths = np.empty((n_swarms, self.max_iterations + 1))
+        optimization_paths[:, 0] = global_best_scores
+        n_recorded = 1
         
         for iteration in range(self.max_iterations):
             w = self.w_init - (self.w_init - self.w_final) * (iteration / self.max_iterations)
             
-            for i in range(self.n_particles):
-                r1, r2 = np.random.rand(2)
-                cognitive_velocity = self.c1 * r1 * (personal_best_positions[i] - positions[i])
-                social_velocity = self.c2 * r2 * (global_best_position - positions[i])
-                
-                velocities[i] = w * velocities[i] + cognitive_velocity + social_velocity
-                
-                velocities[i] = np.clip(velocities[i], -0.5, 0.5)
-                
-                positions[i] += velocities[i]
-                
-                positions[i] = np.clip(positions[i], 0, 1)
-                
-                current_score = self._evaluate_fitness(positions[i], features)
-                
-                if current_score > personal_best_scores[i]:
-                    personal_best_scores[i] = current_score
-                    personal_best_positions[i] = np.copy(positions[i])
-                    
-                    if current_score > global_best_score:
-                        global_best_score = current_score
-                        global_best_position = np.copy(positions[i])
+            # Synchronous update of every swarm; each particle draws its own r1, r2
+            r1 = coefficients[iteration, :, :, 0:1]
+            r2 = coefficients[iteration, :, :, 1:2]
+            velocities = (w * velocities
+                          + self.c1 * r1 * (personal_best_positions - positions)
+                          + self.c2 * r2 * (global_best_positions[:, np.newaxis] - positions))
+            np.clip(velocities, -0.5, 0.5, out=velocities)
+            
+            positions += velocities
+            np.clip(positions, 0, 1, out=positions)
+            
+            scores = self._evaluate_fitness_batch(
+                positions.reshape(-1, self.dimensions), distinct_features, counts,
+                row_scores.reshape(-1, distinct_features.shape[0])
+            ).reshape(n_swarms, self.n_particles)
+            
+            improved = scores > personal_best_scores
+            personal_best_positions[improved] = positions[improved]
+            personal_best_scores[improved] = scores[improved]
+            
+            best_idx = np.argmax(personal_best_scores, axis=1)
+            best_scores = personal_best_scores[swarms, best_idx]
+            moved = best_scores > global_best_scores
+            global_best_scores[moved] = best_scores[moved]
+            global_best_positions[moved] = personal_best_positions[swarms[moved], best_idx[moved]]
+            # A new global best was a personal best set this iteration, so its rows are still in row_scores
+            global_best_row_scores[moved] = row_scores[swarms[moved], best_idx[moved]]
             
-            optimization_path.append(float(global_best_score))
+            optimization_paths[:, iteration + 1] = global_best_scores
+            n_recorded = iteration + 2
             
-            if iteration > 10 and abs(optimization_path[-1] - optimization_path[-10]) < 0.001:
+            # Stop once every swarm has plateaued: its last 10 global bests barely vary
+            if iteration > 10 and np.all(optimization_paths[:, iteration - 8:iteration + 2].var(axis=1) < 1e-6):
                 break
         
-        risk_scores = self._calculate_risk_scores(global_best_position, features)
+        # Trends and findings come from the best swarm only
+        winner = np.argmax(global_best_scores)
+        global_best_position = global_best_positions[winner]
+        optimization_path = optimization_paths[winner]
+        
+        risk_scores = self._calculate_risk_scores(global_best_row_scores[winner][row_of_log])
         
         threshold = 0.6
-        high_risk_indices = np.where(risk_scores > threshold)[0]
-        findings = []
+        high_risk_indices = np.flatnonzero(risk_scores > threshold)
+        
+        # Only the riskiest max_findings logs become findings, highest score first, lower index on ties
+        top_indices = high_risk_indices
+        if top_indices.size > self.max_findings:
+            top_risks = risk_scores[top_indices]
+            cutoff = -np.partition(-top_risks, self.max_findings - 1)[self.max_findings - 1]
+            above = top_indices[top_risks > cutoff]
+            tied = top_indices[top_risks == cutoff]
+            top_indices = np.concatenate((above, tied[:self.max_findings - above.size]))
+        top_indices = top_indices[np.lexsort((top_indices, -risk_scores[top_indices]))]
+        
+        # Factor contributions of every finding at once; a stable sort keeps lower factors first on ties
+        contributions = features[top_indices] * global_best_position
+        factor_order = np.argsort(-contributions, axis=1, kind='stable')[:, :5]
         
-        for idx in high_risk_indices:
+        findings = []
+        for row, idx in enumerate(top_indices):
             orig_idx = log_mapping[idx]
             log = logs[orig_idx]
             
-            factor_scores = self._get_factor_scores(global_best_position, features[idx])
             findings.append({
                 "log_index": orig_idx,
                 "risk_score": float(risk_scores[idx]),
@@ -132,155 +290,146 @@ class PSOLogAnalyzer:
                 "source_ip": log.get('source_ip', ''),
                 "destination_ip": log.get('destination_ip', ''),
                 "event_type": log.get('event_type', ''),
-                "contributing_factors": self._get_contributing_factors(factor_scores, log)
+                "contributing_factors": self._get_contributing_factors(factor_order[row], contributions[row], log)
             })
         
-        findings.sort(key=lambda x: x["risk_score"], reverse=True)
+        security_trends = self._analyze_security_trends(columns, global_best_position)
         
-        security_trends = self._analyze_security_trends(logs, global_best_position)
-        
-        overall_risk = self._calculate_overall_risk(risk_scores, findings)
+        overall_risk = self._calculate_overall_risk(risk_scores, features[high_risk_indices])
         
         return {
             "algorithm": "pso",
             "risk_score": float(overall_risk),
             "findings": findings,
             "security_trends": security_trends,
-            "optimization_path": optimization_path
+            "optimization_path": optimization_path[:n_recorded].tolist()
         }
 
-    def _extract_features(self, logs: List[Dict[str, Any]]) -> Tuple[np.ndarray, List[int]]:
-        features = []
-        log_indices = []
-        
-        for i, log in enumerate(logs):
-            feature_vector = np.zeros(self.dimensions)
-            
-            location = log.get('location', '')
-            if location in self.security_patterns['high_risk_locations']:
-                feature_vector[0] = 1.0
-            
-            src_ip = log.get('source_ip', '')
-            if src_ip and not (src_ip.startswith('192.168.') or src_ip.startswith('10.')):
-                feature_vector[1] = 1.0
-                
-            dst_ip = log.get('destination_ip', '')
-            if dst_ip and not (dst_ip.startswith('192.168.') or dst_ip.startswith('10.')):
-                feature_vector[2] = 0.7
-                
-            port = log.get('destination_port', 0)
-            if port in self.security_patterns['suspicious_ports']['very_high']:
-                feature_vector[3] = 1.0
-            elif port in self.security_patterns['suspicious_ports']['high']:
-                feature_vector[4] = 0.8
-            elif port in self.security_patterns['suspicious_ports']['medium']:
-                feature_vector[5] = 0.5
-                
-            protocol = log.get('protocol', '')
-            if protocol in self.security_patterns['suspicious_protocols']:
-                feature_vector[6] = 0.9
-                
-            process = log.get('process_name', '').lower()
-            for malicious in self.security_patterns['malicious_processes']:
-                if malicious in process:
-                    feature_vector[7] = 1.0
-                    break
-                    
-            filename = log.get('filename', '').lower()
-            if filename:
-                for susp in self.security_patterns['suspicious_files']:
-                    if susp in filename:
-                        feature_vector[8] = 0.8
-                        break
-                        
-            event_type = log.get('event_type', '')
-            if event_type in self.security_patterns['attack_events']:
-                feature_vector[9] = 1.0
-                
-            status = log.get('status', '').lower()
-            if status == 'failed':
-                feature_vector[10] = 0.7
-            
-            if event_type == 'login' and status == 'failed':
-                feature_vector[11] = 0.9
-                
-            bytes_sent = log.get('bytes_sent', 0)
-            bytes_received = log.get('bytes_received', 0)
-            
-            if bytes_sent > 1000000:  
-                feature_vector[12] = 0.8
-                
-            if bytes_received > 5000000:  
-                feature_vector[13] = 0.6
-                
-            if bytes_received > 0 and bytes_sent / bytes_received > 10:
-                feature_vector[14] = 0.7
-            
-            if np.sum(feature_vector) > 0:
-                features.append(feature_vector)
-                log_indices.append(i)
-        
-        return np.array(features), log_indices
+    @staticmethod
+    def _port_index(port: Any) -> int:
+        # Anything that does not compare equal to a valid port number maps to 0, which is in no risk bucket
+        try:
+            index = int(port)
+        except (TypeError, ValueError, OverflowError):
+            return 0
+        return index if index == port and 0 <= index < 65536 else 0
 
-    def _evaluate_fitness(self, position: np.ndarray, features: np.ndarray) -> float:
-        if features.shape[0] == 0:
-            return 0.0
-            
-        risk_scores = np.dot(features, position)
-        
-        max_score = np.max(risk_scores)
-        if max_score > 0:
-            risk_scores = risk_scores / max_score
-                
-        mean_score = np.mean(risk_scores)
-        variance = np.var(risk_scores)
+    def _log_columns(self, logs: List[Dict[str, Any]]) -> LogColumns:
+        """Read every field the feature and trend passes use, one column at a time"""
+        n_logs = len(logs)
+        return LogColumns(
+            timestamp=[log.get('timestamp', '') for log in logs],
+            source_ip=[log.get('source_ip', '') for log in logs],
+            destination_ip=[log.get('destination_ip', '') for log in logs],
+            destination_port=np.fromiter(
+                (self._port_index(log.get('destination_port', 0)) for log in logs), dtype=np.int32, count=n_logs
+            ),
+            protocol=[log.get('protocol', '') for log in logs],
+            location=[log.get('location', '') for log in logs],
+            process_name=[log.get('process_name', '').lower() for log in logs],
+            filename=[log.get('filename', '').lower() for log in logs],
+            # Missing event types read 'unknown', which the trends report and no feature matches
+            event_type=[log.get('event_type', 'unknown') for log in logs],
+            status=[log.get('status', '').lower() for log in logs],
+            bytes_sent=byte_counts([log.get('bytes_sent', 0) for log in logs]),
+            bytes_received=byte_counts([log.get('bytes_received', 0) for log in logs])
+        )
+
+    def _extract_features(self, columns: LogColumns) -> Tuple[np.ndarray, List[int]]:
+        n_logs = len(columns.timestamp)
+        features = np.zeros((n_logs, self.dimensions), dtype=np.float32)
+        patterns = self.security_patterns
+        
+        locations = columns.location
+        ports = columns.destination_port
+        protocols = columns.protocol
+        processes = columns.process_name
+        filenames = columns.filename
+        event_types = columns.event_type
+        statuses = columns.status
+        bytes_sent = columns.bytes_sent
+        bytes_received = columns.bytes_received
+        
+        features[:, 0] = np.isin(locations, patterns['high_risk_locations'])
+        
+        features[:, 1] = external_ips(columns.source_ip, _INTERNAL_PREFIXES)
+        features[:, 2] = np.where(external_ips(columns.destination_ip, _INTERNAL_PREFIXES), 0.7, 0.0)
+        
+        port_buckets = self._port_buckets[ports]
+        features[:, 3] = port_buckets == 1
+        features[:, 4] = np.where(port_buckets == 2, 0.8, 0.0)
+        features[:, 5] = np.where(port_buckets == 3, 0.5, 0.0)
+        
+        features[:, 6] = np.where(np.isin(protocols, patterns['suspicious_protocols']), 0.9, 0.0)
+        
+        process_search = self._malicious_process_rx.search
+        features[:, 7] = np.fromiter(
+            (process_search(process) is not None for process in processes),
+            dtype=bool, count=n_logs
+        )
         
-        skewness = 0
-        if len(risk_scores) > 2:
-            std = np.std(risk_scores)
-            if std > 0:
-                skewness = np.mean(((risk_scores - mean_score) / std) ** 3)
+        file_search = self._suspicious_file_rx.search
+        suspicious_file = np.fromiter(
+            (file_search(filename) is not None for filename in filenames),
+            dtype=bool, count=n_logs
+        )
+        features[:, 8] = np.where(suspicious_file, 0.8, 0.0)
         
-        high_threshold = 0.7
-        medium_threshold = 0.4
+        features[:, 9] = np.isin(event_types, patterns['attack_events'])
         
-        high_risk_ratio = np.mean(risk_scores > high_threshold)
-        medium_risk_ratio = np.mean((risk_scores > medium_threshold) & (risk_scores <= high_threshold))
+        failed = np.array([status == 'failed' for status in statuses], dtype=bool)
+        features[:, 10] = np.where(failed, 0.7, 0.0)
         
-        threshold_quality = (1 - min(high_risk_ratio * 10, 1.0)) * 0.6 + medium_risk_ratio * 0.4
+        failed_login = failed & np.array([event_type == 'login' for event_type in event_types], dtype=bool)
+        features[:, 11] = np.where(failed_login, 0.9, 0.0)
         
-        feature_utilization = np.std(position) * -1 + 0.5  
+        features[:, 12] = np.where(bytes_sent > 1000000, 0.8, 0.0)
+        features[:, 13] = np.where(bytes_received > 5000000, 0.6, 0.0)
         
-        key_feature_indices = [0, 3, 7, 9]  
-        key_feature_alignment = np.mean(position[key_feature_indices])
+        has_response = bytes_received > 0
+        ratio = np.divide(bytes_sent, bytes_received, out=np.zeros(n_logs), where=has_response)
+        features[:, 14] = np.where(has_response & (ratio > 10), 0.7, 0.0)
         
-        fitness = (
-            variance * 2.0 +                  # Reward separation between events
-            max(0, skewness) * 1.0 +          # Reward positive skew
-            threshold_quality * 3.0 +         # Reward good threshold properties
-            feature_utilization * 1.0 +       # Reward balanced feature usage
-            key_feature_alignment * 2.0       # Reward security-aligned weights
-        )
+        self._trend_flags = features[:, self._trend_columns] > 0
         
+        keep = features.sum(axis=1) > 0
+        return features[keep], np.flatnonzero(keep).tolist()
+
+    def _distinct_rows(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Collapse the feature matrix to its distinct rows, their log counts and each log's row"""
+        # Every feature column holds either 0 or one fixed weight, so the set bits identify a row
+        codes = (features > 0) @ (1 << np.arange(self.dimensions))
+        codes, first, row_of_log, counts = np.unique(codes, return_index=True, return_inverse=True, return_counts=True)
+        
+        # Padded with a zero column for the swarm kernel
+        distinct = np.zeros((first.size, _PADDED_DIMENSIONS), dtype=np.float32)
+        distinct[:, :self.dimensions] = features[first]
+        return distinct, counts, row_of_log
+
+    def _evaluate_fitness_batch(self, positions: np.ndarray, features: np.ndarray, counts: np.ndarray,
+                                scores: np.ndarray) -> np.ndarray:
+        """Fitness of every particle at once; row k of the padded features stands for counts[k] logs.
+        Each particle's raw per-row scores are left in the matching row of scores"""
+        n_logs = counts.sum()
+        if n_logs == 0:
+            return np.zeros(positions.shape[0])
+        
+        fitness = np.empty(positions.shape[0])
+        weights = np.zeros((positions.shape[0], _PADDED_DIMENSIONS), dtype=np.float32)
+        weights[:, :self.dimensions] = positions
+        _swarm_fitness(features, counts, weights, np.ascontiguousarray(positions, dtype=np.float32), scores, fitness)
         return fitness
 
-    def _calculate_risk_scores(self, position: np.ndarray, features: np.ndarray) -> np.ndarray:
-        scores = np.dot(features, position)
-        
+    def _calculate_risk_scores(self, scores: np.ndarray) -> np.ndarray:
+        # scores is a fresh per-log array of raw scores. This is the only normalisation by the
+        # maximum, done in place; the swarm kernel folds it into its thresholds instead
         max_score = np.max(scores)
         if max_score > 0:
-            scores = scores / max_score
+            scores /= max_score
         
         return scores
 
-    def _get_factor_scores(self, position: np.ndarray, feature_vector: np.ndarray) -> List[Tuple[int, float]]:
-        factor_scores = [(i, position[i] * feature_vector[i]) for i in range(self.dimensions)]
-        
-        factor_scores.sort(key=lambda x: x[1], reverse=True)
-        
-        return factor_scores
-
-    def _get_contributing_factors(self, factor_scores: List[Tuple[int, float]], log: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _get_contributing_factors(self, factor_order: np.ndarray, contributions: np.ndarray, log: Dict[str, Any]) -> List[Dict[str, Any]]:
         factors = []
         
         factor_descriptions = [
@@ -301,7 +450,9 @@ class PSOLogAnalyzer:
             "Unusual data transfer ratio"
         ]
         
-        for idx, score in factor_scores:
+        # factor_order holds the five largest contributions, largest first
+        for idx in factor_order.tolist():
+            score = contributions[idx]
             if score > 0.01:  
                 detail = self._get_factor_detail(idx, log)
                 factors.append({
@@ -310,7 +461,7 @@ class PSOLogAnalyzer:
                     "detail": detail
                 })
         
-        return factors[:5]  
+        return factors  
 
     def _get_factor_detail(self, factor_idx: int, log: Dict[str, Any]) -> str:
         if factor_idx == 0:
@@ -338,93 +489,53 @@ class PSOLogAnalyzer:
         else:
             return ""
 
-    def _analyze_security_trends(self, logs: List[Dict[str, Any]], position: np.ndarray) -> Dict[str, Any]:
-        hourly_data = {}
-        event_distribution = {}
-        ip_risk_scores = {}
-        
-        for log in logs:
-            if 'timestamp' not in log:
-                continue
-                
-            try:
-                if log['timestamp'].endswith('Z'):
-                    timestamp = log['timestamp'][:-1] + '+00:00'
-                else:
-                    timestamp = log['timestamp']
-                    
-                dt = datetime.fromisoformat(timestamp)
-                hour_key = dt.strftime('%Y-%m-%d %H:00')
-                
-                if hour_key not in hourly_data:
-                    hourly_data[hour_key] = {'count': 0, 'risks': []}
-                
-                hourly_data[hour_key]['count'] += 1
-                
-                risk_score = 0.0
-                
-                if log.get('location', '') in self.security_patterns['high_risk_locations']:
-                    risk_score += position[0]
-                    
-                port = log.get('destination_port', 0)
-                if port in self.security_patterns['suspicious_ports']['very_high']:
-                    risk_score += position[3]
-                elif port in self.security_patterns['suspicious_ports']['high']:
-                    risk_score += position[4]
-                    
-                if log.get('event_type', '') in self.security_patterns['attack_events']:
-                    risk_score += position[9]
-                    
-                if log.get('status', '').lower() == 'failed':
-                    risk_score += position[10]
-                
-                hourly_data[hour_key]['risks'].append(risk_score)
-                
-                event_type = log.get('event_type', 'unknown')
-                if event_type not in event_distribution:
-                    event_distribution[event_type] = 0
-                event_distribution[event_type] += 1
-                
-                src_ip = log.get('source_ip', '')
-                if src_ip:
-                    if src_ip not in ip_risk_scores:
-                        ip_risk_scores[src_ip] = {'count': 0, 'risk_sum': 0.0}
-                    ip_risk_scores[src_ip]['count'] += 1
-                    ip_risk_scores[src_ip]['risk_sum'] += risk_score
-                
-            except (ValueError, TypeError):
-                continue
-        
-        hourly_risks = []
-        for hour, data in hourly_data.items():
-            if data['risks']:
-                avg_risk = sum(data['risks']) / len(data['risks'])
-                hourly_risks.append({
-                    'hour': hour,
-                    'count': data['count'],
-                    'avg_risk': float(avg_risk)
-                })
-        
-        hourly_risks.sort(key=lambda x: x['hour'])
-        
-        risky_ips = []
-        for ip, data in ip_risk_scores.items():
-            avg_risk = data['risk_sum'] / data['count']
-            risky_ips.append({
-                'ip': ip,
-                'count': data['count'],
-                'avg_risk': float(avg_risk)
-            })
+    def _analyze_security_trends(self, columns: LogColumns, position: np.ndarray) -> Dict[str, Any]:
+        # High-risk location, very high or high port, attack event and failed status, reusing the feature pass
+        log_risks = self._trend_flags @ position[self._trend_columns].astype(np.float64)
+        
+        timestamps = parse_timestamps(columns.timestamp)
+        parsed = np.flatnonzero(~np.isnat(timestamps))
+        if parsed.size == 0:
+            return {'hourly_trends': [], 'event_distribution': [], 'risky_ips': []}
+        
+        event_types = [columns.event_type[i] for i in parsed]
+        src_ips = [columns.source_ip[i] for i in parsed]
+        risks = log_risks[parsed]
+        
+        hours, hour_groups = np.unique(timestamps[parsed].astype('datetime64[h]'), return_inverse=True)
+        hour_counts = np.bincount(hour_groups)
+        hour_risks = np.bincount(hour_groups, weights=risks)
+        hours = np.char.add(np.char.replace(np.datetime_as_string(hours, unit='h'), 'T', ' '), ':00')
+        hourly_risks = [
+            {'hour': hour, 'count': count, 'avg_risk': risk_sum / count}
+            for hour, count, risk_sum in zip(hours.tolist(), hour_counts.tolist(), hour_risks.tolist())
+        ]
         
-        risky_ips.sort(key=lambda x: x['avg_risk'], reverse=True)
+        # Events and IPs are counted by their raw values, in the order in which they first appear
+        event_counts = {}
+        for event in event_types:
+            event_counts[event] = event_counts.get(event, 0) + 1
+        event_distribution = [{'event': event, 'count': count} for event, count in event_counts.items()]
+        
+        ip_codes = {}
+        ip_groups = np.array([ip_codes.setdefault(ip, len(ip_codes)) if ip else -1 for ip in src_ips], dtype=np.int64)
+        has_ip = ip_groups >= 0
+        ips = list(ip_codes)
+        ip_counts = np.bincount(ip_groups[has_ip], minlength=len(ips))
+        ip_avg_risks = np.bincount(ip_groups[has_ip], weights=risks[has_ip], minlength=len(ips)) / np.maximum(ip_counts, 1)
+        ip_order = np.argsort(-ip_avg_risks, kind='stable')[:5]
+        risky_ips = [
+            {'ip': ip, 'count': count, 'avg_risk': avg_risk}
+            for ip, count, avg_risk in zip([ips[i] for i in ip_order], ip_counts[ip_order].tolist(), ip_avg_risks[ip_order].tolist())
+        ]
         
         return {
             'hourly_trends': hourly_risks,
-            'event_distribution': [{'event': k, 'count': v} for k, v in event_distribution.items()],
-            'risky_ips': risky_ips[:5]  
+            'event_distribution': event_distribution,
+            'risky_ips': risky_ips
         }
 
-    def _calculate_overall_risk(self, risk_scores: np.ndarray, findings: List[Dict[str, Any]]) -> float:
+    def _calculate_overall_risk(self, risk_scores: np.ndarray, high_risk_features: np.ndarray) -> float:
         """Calculate overall risk score based on individual log risk scores"""
         if len(risk_scores) == 0:
             return 0.0
@@ -435,13 +546,11 @@ class PSOLogAnalyzer:
         
         attack_pattern_factor = 0.0
         
-        attack_events = [f for f in findings 
-                         if f.get('event_type', '') in self.security_patterns['attack_events']]
-        
-        if len(attack_events) > 0:
+        # Every high-risk log counts, including those beyond the findings cap; column 9 flags attack events
+        if np.any(high_risk_features[:, 9] > 0):
             attack_pattern_factor = 0.3
             
-        if len(findings) >= 3:
+        if len(high_risk_features) >= 3:
             attack_pattern_factor += 0.2
         
         overall_risk = (
@@ -1,9 +1,93 @@
 import argparse
+from bisect import bisect_right
 import json
 import sys
 from datetime import datetime
+from operator import methodcaller
 import re
 import ipaddress
+import socket
+import warnings
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import ijson
+import msgspec
+import numpy as np
+import orjson
+
+# Event types the algorithms test for; any other type codes as _EVENT_OTHER
+_EVENT_DOWNLOAD, _EVENT_LATERAL, _EVENT_LOGIN, _EVENT_OTHER = range(4)
+_EVENT_KINDS = {'file_download': _EVENT_DOWNLOAD, 'lateral_movement': _EVENT_LATERAL, 'login': _EVENT_LOGIN}
+
+# IPv4 networks ipaddress counts as private, as (network address, netmask) pairs
+_PRIVATE_IPV4_NETWORKS = np.array([
+    (int(network.network_address), int(network.netmask))
+    for network in map(ipaddress.IPv4Network, [
+        '0.0.0.0/8', '10.0.0.0/8', '127.0.0.0/8', '169.254.0.0/16', '172.16.0.0/12',
+        '192.0.0.0/29', '192.0.0.170/31', '192.0.2.0/24', '192.168.0.0/16', '198.18.0.0/15',
+        '198.51.100.0/24', '203.0.113.0/24', '240.0.0.0/4', '255.255.255.255/32'
+    ])
+], dtype=np.uint32)
+
+# Overall status by threat score: below 0.3 is safe, below 0.7 suspicious, anything else a threat
+_THRESHOLDS = (0.3, 0.7)
+_STATUSES = ("safe", "suspicious", "threat")
+
+
+class LogColumns(NamedTuple):
+    """Column-wise view of the logs, read once and shared by every algorithm"""
+    location: List[Any]
+    status: List[Any]
+    process_lower: List[str]
+    event_type: np.ndarray            # Code per log indexing event_types
+    event_types: List[Any]            # Distinct event type values in order of first appearance
+    source_ip: np.ndarray             # Code per log indexing source_ips
+    source_ips: List[Any]             # Distinct source IP values in order of first appearance
+    destination_ip: List[Any]
+    filename_lower: List[str]         # Lowered for file downloads, '' for other events
+    protocol: List[Any]
+    destination_port: List[Any]
+    bytes_sent: np.ndarray
+    bytes_received: np.ndarray
+    timestamp: List[Any]              # msgspec.UNSET for a log without a timestamp
+
+
+class LogRecord(msgspec.Struct):
+    """One log as decoded in serve mode; missing fields get the defaults _to_columns reads dicts with"""
+    location: Any = ''
+    status: Any = ''
+    process_name: Any = ''
+    event_type: Any = ''
+    source_ip: Any = ''
+    destination_ip: Any = ''
+    filename: Any = ''
+    protocol: Any = ''
+    destination_port: Any = 0
+    bytes_sent: Any = 0
+    bytes_received: Any = 0
+    timestamp: Any = msgspec.UNSET
+
+
+class LogBatch(msgspec.Struct):
+    logs: Optional[List[LogRecord]] = None
+
+
+class LogFlags(NamedTuple):
+    """Per-log boolean predicates shared by the algorithms"""
+    login: np.ndarray
+    download: np.ndarray
+    lateral: np.ndarray
+    failed: np.ndarray                # Status 'failed' in any case
+    failed_login: np.ndarray          # Login with status exactly 'failed'
+    suspicious_location: np.ndarray
+    suspicious_process: np.ndarray    # Contains a suspicious process name
+    known_bad_process: np.ndarray     # Is exactly a suspicious process name
+    suspicious_file: np.ndarray
+    suspicious_port: np.ndarray       # Suspicious protocol on one of its ports
+    private_destination: np.ndarray
 
 class AegiswarmAnalyzer:
     def __init__(self):
@@ -24,30 +108,60 @@ class AegiswarmAnalyzer:
             'RDP': [3389], 
             'SSH': [22]
         }
+        
+        self._suspicious_locations = frozenset(self.suspicious_locations)
+        self._suspicious_processes = frozenset(self.suspicious_process_names)
+        self._suspicious_process_rx = re.compile('|'.join(map(re.escape, self.suspicious_process_names)))
+        self._suspicious_file_rx = re.compile('|'.join(self.suspicious_file_patterns))
+        self._suspicious_ports = frozenset(
+            (protocol, port) for protocol, ports in self.suspicious_protocols.items() for port in ports
+        )
 
     def analyze_logs(self, log_data):
         """Main function to analyze logs using multiple swarm algorithms"""
         if not log_data or 'logs' not in log_data or not log_data['logs']:
-            return {
-                "overall_status": "safe",
-                "threat_score": 0.0,
-                "detection_summary": {
-                    "aco": 0.0,
-                    "pso": 0.0,
-                    "abc": 0.0,
-                    "firefly": 0.0,
-                    "fss": 0.0,
-                    "gwo": 0.0
-                }
-            }
+            return self._safe_result()
+        
+        return self._analyze_columns(self._to_columns(log_data['logs']))
+    
+    def analyze_stream(self, logs):
+        """Analyze logs from any iterable, reading each record once without keeping it"""
+        columns = self._to_columns(logs)
+        if not columns.location:
+            return self._safe_result()
+        
+        return self._analyze_columns(columns)
+    
+    def analyze_records(self, records):
+        """Analyze logs already decoded into LogRecord structs"""
+        if not records:
+            return self._safe_result()
         
-        # Run each swarm algorithm on the logs
-        aco_score = self.ant_colony_optimization(log_data['logs'])
-        pso_score = self.particle_swarm_optimization(log_data['logs'])
-        abc_score = self.artificial_bee_colony(log_data['logs'])
-        firefly_score = self.firefly_algorithm(log_data['logs'])
-        fss_score = self.fish_school_search(log_data['logs'])
-        gwo_score = self.grey_wolf_optimizer(log_data['logs'])
+        return self._analyze_columns(self._to_columns(records, getattr))
+    
+    def _safe_result(self):
+        return {
+            "overall_status": "safe",
+            "threat_score": 0.0,
+            "detection_summary": {
+                "aco": 0.0,
+                "pso": 0.0,
+                "abc": 0.0,
+                "firefly": 0.0,
+                "fss": 0.0,
+                "gwo": 0.0
+            }
+        }
+    
+    def _analyze_columns(self, columns):
+        # Evaluate every shared predicate once, then run each swarm algorithm on the columns and flags
+        flags = self._extract_flags(columns)
+        aco_score = self.ant_colony_optimization(columns, flags)
+        pso_score = self.particle_swarm_optimization(columns, flags)
+        abc_score = self.artificial_bee_colony(columns, flags)
+        firefly_score = self.firefly_algorithm(columns, flags)
+        fss_score = self.fish_school_search(columns, flags)
+        gwo_score = self.grey_wolf_optimizer(columns, flags)
         
         # Calculate overall threat score as weighted average
         threat_score = (aco_score * 0.15 + 
@@ -58,12 +172,7 @@ class AegiswarmAnalyzer:
                          gwo_score * 0.1)
         
         # Determine overall status based on threat score
-        if threat_score < 0.3:
-            overall_status = "safe"
-        elif threat_score < 0.7:
-            overall_status = "suspicious"
-        else:
-            overall_status = "threat"
+        overall_status = _STATUSES[bisect_right(_THRESHOLDS, threat_score)]
             
         return {
             "overall_status": overall_status,
@@ -77,34 +186,110 @@ class AegiswarmAnalyzer:
                 "gwo": gwo_score
             }
         }
+    
+    def _to_columns(self, logs: Iterable[Any], field: Callable[[Any, str, Any], Any] = dict.get) -> LogColumns:
+        """Fetch every field the algorithms use from each log in a single pass, so logs may be a
+        stream whose records are dropped as soon as they are read. field(log, name, default) reads
+        one field: dict.get for parsed JSON objects, getattr for decoded LogRecords"""
+        location, status, process_lower, event_type, source_ip, destination_ip = [], [], [], [], [], []
+        filename_lower, protocol, destination_port, bytes_sent, bytes_received, timestamp = [], [], [], [], [], []
+        for log in logs:
+            location.append(field(log, 'location', ''))
+            status.append(field(log, 'status', ''))
+            process_lower.append(field(log, 'process_name', '').lower())
+            event = field(log, 'event_type', '')
+            event_type.append(event)
+            source_ip.append(field(log, 'source_ip', ''))
+            destination_ip.append(field(log, 'destination_ip', ''))
+            # Only a download's filename is ever checked, so only it has to be a string
+            filename_lower.append(field(log, 'filename', '').lower() if event == 'file_download' else '')
+            protocol.append(field(log, 'protocol', ''))
+            destination_port.append(field(log, 'destination_port', 0))
+            bytes_sent.append(field(log, 'bytes_sent', 0))
+            bytes_received.append(field(log, 'bytes_received', 0))
+            # UNSET marks a log without a timestamp; an explicit null is kept and fails to parse
+            timestamp.append(field(log, 'timestamp', msgspec.UNSET))
+        
+        # Raw values are interned, so a missing, empty or null IP (or event type) each keep their own code
+        event_codes, event_types = self._interned(event_type)
+        source_ip_codes, source_ips = self._interned(source_ip)
+        
+        return LogColumns(
+            location=location,
+            status=status,
+            process_lower=process_lower,
+            event_type=event_codes,
+            event_types=event_types,
+            source_ip=source_ip_codes,
+            source_ips=source_ips,
+            destination_ip=destination_ip,
+            filename_lower=filename_lower,
+            protocol=protocol,
+            destination_port=destination_port,
+            bytes_sent=self._byte_counts(bytes_sent),
+            bytes_received=self._byte_counts(bytes_received),
+            timestamp=timestamp
+        )
+        
+    def _interned(self, values):
+        """An int code per value and the distinct values it indexes, in order of first appearance"""
+        distinct = {}
+        codes = np.array([distinct.setdefault(value, len(distinct)) for value in values], dtype=np.int64)
+        return codes, list(distinct)
+        
+    def _extract_flags(self, columns: LogColumns) -> LogFlags:
+        """Evaluate every per-log predicate the algorithms share, once per column"""
+        # Each distinct event type is looked up once, then spread to its events by code
+        event_kinds = np.array([_EVENT_KINDS.get(event, _EVENT_OTHER) for event in columns.event_types], dtype=np.int8)
+        event_codes = event_kinds[columns.event_type]
         
-    def ant_colony_optimization(self, logs):
+        login = event_codes == _EVENT_LOGIN
+        return LogFlags(
+            login=login,
+            download=event_codes == _EVENT_DOWNLOAD,
+            lateral=event_codes == _EVENT_LATERAL,
+            # Statuses are only lowercased to be compared, one at a time as they are tested
+            failed=np.fromiter(map('failed'.__eq__, map(methodcaller('lower'), columns.status)),
+                               dtype=bool, count=len(columns.status)),
+            failed_login=login & (np.asarray(columns.status) == 'failed'),
+            suspicious_location=np.fromiter(map(self._suspicious_locations.__contains__, columns.location),
+                                            dtype=bool, count=len(columns.location)),
+            suspicious_process=self._search_rows(self._suspicious_process_rx, columns.process_lower),
+            known_bad_process=np.fromiter(map(self._suspicious_processes.__contains__, columns.process_lower),
+                                          dtype=bool, count=len(columns.process_lower)),
+            suspicious_file=self._search_rows(self._suspicious_file_rx, columns.filename_lower),
+            suspicious_port=np.fromiter(map(self._suspicious_ports.__contains__,
+                                            zip(columns.protocol, columns.destination_port)),
+                                        dtype=bool, count=len(columns.protocol)),
+            private_destination=self._private_ips(columns.destination_ip)
+        )
+        
+    def ant_colony_optimization(self, columns, flags):
         """
         ACO algorithm for log collection & aggregation
         Focuses on finding patterns in log sources and types
         """
         score = 0.0
+        n_logs = len(columns.location)
         
         # Check for logs from suspicious locations
-        location_count = sum(1 for log in logs if log.get('location', '') in self.suspicious_locations)
+        location_count = np.count_nonzero(flags.suspicious_location)
         if location_count > 0:
-            score += 0.3 * (location_count / len(logs))
+            score += 0.3 * (location_count / n_logs)
         
         # Check for logs with failed status
-        failed_count = sum(1 for log in logs if log.get('status', '').lower() == 'failed')
+        failed_count = np.count_nonzero(flags.failed)
         if failed_count > 0:
-            score += 0.3 * (failed_count / len(logs))
+            score += 0.3 * (failed_count / n_logs)
             
-        # Check for suspicious process names
-        process_count = sum(1 for log in logs 
-                          if any(proc in log.get('process_name', '').lower() 
-                                for proc in self.suspicious_process_names))
+        # Check for suspicious process names, any of them as a substring
+        process_count = np.count_nonzero(flags.suspicious_process)
         if process_count > 0:
-            score += 0.4 * (process_count / len(logs))
+            score += 0.4 * (process_count / n_logs)
             
         return min(score, 1.0)
         
-    def particle_swarm_optimization(self, logs):
+    def particle_swarm_optimization(self, columns, flags):
         """
         PSO algorithm for real-time threat detection
         Focuses on detecting active threats by monitoring patterns
@@ -112,70 +297,49 @@ class AegiswarmAnalyzer:
         score = 0.0
         
         # Check for lateral movement patterns
-        lateral_movement = any(log.get('event_type', '') == 'lateral_movement' for log in logs)
-        if lateral_movement:
+        if flags.lateral.any():
             score += 0.5
         
         # Check for large data transfers
-        large_transfers = any(log.get('bytes_received', 0) > 1000000 for log in logs)
-        if large_transfers:
+        if np.any(columns.bytes_received > 1000000):
             score += 0.4
             
         # Check for suspicious file downloads
-        suspicious_downloads = any(log.get('event_type', '') == 'file_download' and
-                                 any(re.search(pattern, log.get('filename', '').lower()) 
-                                     for pattern in self.suspicious_file_patterns)
-                                 for log in logs)
-        if suspicious_downloads:
+        if np.any(flags.download & flags.suspicious_file):
             score += 0.3
             
         return min(score, 1.0)
         
-    def artificial_bee_colony(self, logs):
+    def artificial_bee_colony(self, columns, flags):
         """
         ABC algorithm for anomaly detection
         Focuses on finding unusual patterns that don't fit normal behavior
         """
         score = 0.0
         
-        # Check if multiple failed logins from same IP
-        ip_login_attempts = {}
-        for log in logs:
-            if log.get('event_type', '') == 'login':
-                ip = log.get('source_ip', '')
-                if ip not in ip_login_attempts:
-                    ip_login_attempts[ip] = {'success': 0, 'failed': 0}
-                
-                if log.get('status', '') == 'failed':
-                    ip_login_attempts[ip]['failed'] += 1
-                else:
-                    ip_login_attempts[ip]['success'] += 1
+        # Any two of these checks saturate the score, so the cheap flag tests run first and
+        # the per-IP count of failed logins is only needed when they leave room for it
         
-        # Check for brute force patterns
-        brute_force_detected = any(attempts['failed'] > 2 for ip, attempts in ip_login_attempts.items())
-        if brute_force_detected:
-            score += 0.6
-            
         # Check for suspicious process names
-        if any(log.get('process_name', '').lower() in self.suspicious_process_names for log in logs):
+        if flags.known_bad_process.any():
             score += 0.7
             
         # Check for unusual ports or protocols
-        unusual_activity = False
-        for log in logs:
-            protocol = log.get('protocol', '')
-            dest_port = log.get('destination_port', 0)
-            
-            if protocol in self.suspicious_protocols and dest_port in self.suspicious_protocols[protocol]:
-                unusual_activity = True
-                break
-                
-        if unusual_activity:
+        if flags.suspicious_port.any():
             score += 0.4
+            if score >= 1.0:
+                return 1.0
+            
+        # Check if multiple failed logins from same IP
+        failed_logins = np.bincount(columns.source_ip[flags.failed_login])
+        
+        # Check for brute force patterns
+        if np.any(failed_logins > 2):
+            score += 0.6
             
         return min(score, 1.0)
         
-    def firefly_algorithm(self, logs):
+    def firefly_algorithm(self, columns, flags):
         """
         Firefly algorithm for event correlation
         Focuses on finding relationships between events
@@ -183,9 +347,9 @@ class AegiswarmAnalyzer:
         score = 0.0
         
         # Check for sequence patterns indicating attack chain
-        has_login = any(log.get('event_type', '') == 'login' for log in logs)
-        has_download = any(log.get('event_type', '') == 'file_download' for log in logs)
-        has_lateral = any(log.get('event_type', '') == 'lateral_movement' for log in logs)
+        has_login = flags.login.any()
+        has_download = flags.download.any()
+        has_lateral = flags.lateral.any()
         
         # Full attack chain
         if has_login and has_download and has_lateral:
@@ -198,62 +362,48 @@ class AegiswarmAnalyzer:
         elif has_login and has_lateral:
             score += 0.4
             
-        # Check for same source IP across multiple events
-        source_ips = {}
-        for log in logs:
-            ip = log.get('source_ip', '')
-            if ip:
-                if ip not in source_ips:
-                    source_ips[ip] = []
-                source_ips[ip].append(log.get('event_type', ''))
+        # Check for same source IP across multiple events: a grouped distinct count of
+        # (IP, event type) pairs per IP, skipping logs without a truthy IP. IP codes
+        # already follow the order of first appearance
+        has_ip = np.fromiter(map(bool, columns.source_ips), dtype=bool, count=len(columns.source_ips))[columns.source_ip]
+        n_event_types = len(columns.event_types)
+        pairs = np.unique(columns.source_ip[has_ip] * n_event_types + columns.event_type[has_ip])
+        distinct_events = np.bincount(pairs // n_event_types)
                 
         # If same IP performs multiple types of suspicious activities
-        for ip, events in source_ips.items():
-            if len(set(events)) > 1:
-                score += 0.2 * len(set(events))
+        for events in distinct_events[distinct_events > 1].tolist():
+            score += 0.2 * events
+            if score >= 1.0:
+                return 1.0
                 
         return min(score, 1.0)
         
-    def fish_school_search(self, logs):
+    def fish_school_search(self, columns, flags):
         """
         FSS algorithm for alert prioritization
         Focuses on identifying which events are most important
         """
         score = 0.0
-        critical_events = 0
         
-        for log in logs:
-            event_score = 0
-            
-            # Check location
-            if log.get('location', '') in self.suspicious_locations:
-                event_score += 0.3
-                
-            # Check process name
-            proc_name = log.get('process_name', '').lower()
-            if any(susp in proc_name for susp in self.suspicious_process_names):
-                event_score += 0.4
-                
-            # Check for file download events with suspicious names
-            if log.get('event_type', '') == 'file_download':
-                filename = log.get('filename', '').lower()
-                if any(re.search(pattern, filename) for pattern in self.suspicious_file_patterns):
-                    event_score += 0.5
-                    
-            # Check for lateral movement
-            if log.get('event_type', '') == 'lateral_movement':
-                event_score += 0.6
-                
-            # If individual event is high priority
-            if event_score > 0.5:
-                critical_events += 1
-                
+        # Suspicious location, process name, file download and lateral movement make a 4-bit code per
+        # event. Each of the 16 codes is scored once, adding the weights in bit order as the old
+        # per-event loop did, and the events are counted per code
+        codes = (flags.suspicious_location
+                 | flags.suspicious_process << 1
+                 | (flags.download & flags.suspicious_file) << 2
+                 | flags.lateral << 3)
+        code_scores = np.zeros(16)
+        for bit, weight in enumerate((0.3, 0.4, 0.5, 0.6)):
+            code_scores += np.where(np.arange(16) & (1 << bit), weight, 0.0)
+        
+        # Count the individual events that are high priority
+        critical_events = int(np.bincount(codes, minlength=16)[code_scores > 0.5].sum())
         if critical_events > 0:
-            score = min(1.0, critical_events / len(logs) + 0.3)
+            score = min(1.0, critical_events / len(columns.location) + 0.3)
             
         return min(score, 1.0)
         
-    def grey_wolf_optimizer(self, logs):
+    def grey_wolf_optimizer(self, columns, flags):
         """
         GWO algorithm for visualization and dashboard
         Focuses on creating meaningful visualizations from data
@@ -261,39 +411,92 @@ class AegiswarmAnalyzer:
         # This algorithm would normally focus on visualization aspects
         # For our analysis, we'll make it focus on detecting APT-like behavior
         score = 0.0
+        n_logs = len(columns.location)
         
         # Check time patterns - APTs usually operate in stages
-        if len(logs) >= 3:
-            timestamps = [datetime.fromisoformat(log.get('timestamp', '').replace('Z', '+00:00')) 
-                         for log in logs if 'timestamp' in log]
-            if timestamps:
-                # Sort timestamps
-                timestamps.sort()
-                # Check if events are spread out with some planning
-                time_diffs = [(timestamps[i+1] - timestamps[i]).total_seconds() 
-                             for i in range(len(timestamps)-1)]
-                
-                # APTs often have deliberate pauses between actions
-                if any(120 <= diff <= 600 for diff in time_diffs):  # 2-10 minute gaps
-                    score += 0.3
+        if n_logs >= 3:
+            # Check if events are spread out with some planning
+            time_diffs = self._timestamp_gaps([timestamp for timestamp in columns.timestamp if timestamp is not msgspec.UNSET])
+            
+            # APTs often have deliberate pauses between actions
+            if np.any((time_diffs >= 120) & (time_diffs <= 600)):  # 2-10 minute gaps
+                score += 0.3
         
         # Check for internal network reconnaissance
-        internal_ips = 0
-        for log in logs:
-            dest_ip = log.get('destination_ip', '')
-            if dest_ip and self._is_private_ip(dest_ip):
-                internal_ips += 1
-                
+        internal_ips = np.count_nonzero(flags.private_destination)
         if internal_ips > 0:
-            score += 0.2 * (internal_ips / len(logs))
+            score += 0.2 * (internal_ips / n_logs)
             
         # Check for evidence of data exfiltration (unusual outbound traffic)
-        outbound_data = sum(log.get('bytes_sent', 0) for log in logs)
+        outbound_data = columns.bytes_sent.sum()
         if outbound_data > 10000:  # Arbitrary threshold
             score += 0.2
             
         return min(score, 1.0)
     
+    def _byte_counts(self, values):
+        """Byte counts as float64, raising TypeError on anything but numbers rather than letting
+        NumPy turn null into NaN or parse numeric strings"""
+        counts = np.array(values)
+        if counts.dtype.kind not in 'biuf':
+            for value in values:
+                if not isinstance(value, (int, float)):
+                    raise TypeError(f"byte count must be a number, not {type(value).__name__}")
+        return counts.astype(np.float64)
+    
+    def _timestamp_gaps(self, timestamps):
+        """Seconds between consecutive timestamps once sorted"""
+        # NumPy parses the batch when every entry is a full ISO string and either all or none
+        # carry a 'Z' suffix. Anything else (UTC offsets, short forms, mixed suffixes) goes
+        # through datetime.fromisoformat, which raises on the values it cannot order
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                utc = [timestamp.endswith('Z') for timestamp in timestamps]
+                if any(utc) and not all(utc):
+                    raise ValueError('mixed UTC and local timestamps')
+                if any(len(timestamp) < 10 for timestamp in timestamps):
+                    raise ValueError('partial timestamp')
+                parsed = np.array([timestamp[:-1] if is_utc else timestamp for timestamp, is_utc in zip(timestamps, utc)],
+                                  dtype='datetime64[us]')
+                return np.diff(np.sort(parsed)) / np.timedelta64(1, 's')
+        except (ValueError, TypeError, AttributeError, Warning):
+            pass
+        
+        parsed = sorted(datetime.fromisoformat(timestamp.replace('Z', '+00:00')) for timestamp in timestamps)
+        return np.array([(later - earlier).total_seconds() for earlier, later in zip(parsed, parsed[1:])])
+    
+    def _search_rows(self, pattern, values):
+        """Flag the strings in which pattern matches, scanning them all as one buffer"""
+        # The patterns are plain words, so no match can span the NUL separators and
+        # each match offset falls inside exactly one value's span
+        lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+        starts = np.cumsum(lengths + 1) - lengths - 1
+        offsets = np.fromiter((match.start() for match in pattern.finditer('\0'.join(values))), dtype=np.int64)
+        
+        flags = np.zeros(len(values), dtype=bool)
+        flags[np.searchsorted(starts, offsets, side='right') - 1] = True
+        return flags
+    
+    def _private_ips(self, ips):
+        """Flag the present IPs that are private, testing IPv4 addresses as packed integers"""
+        packed = np.zeros(len(ips), dtype=np.uint32)
+        private = np.zeros(len(ips), dtype=bool)
+        is_ipv4 = np.zeros(len(ips), dtype=bool)
+        for i, ip in enumerate(ips):
+            if not ip:
+                continue
+            try:
+                # inet_pton accepts exactly the dotted quads ipaddress does
+                packed[i] = int.from_bytes(socket.inet_pton(socket.AF_INET, ip), 'big')
+                is_ipv4[i] = True
+            except (OSError, TypeError, ValueError):
+                private[i] = self._is_private_ip(ip)  # IPv6 and anything else
+        
+        networks, netmasks = _PRIVATE_IPV4_NETWORKS.T
+        in_network = ((packed[:, np.newaxis] & netmasks) == networks).any(axis=1)
+        return private | (is_ipv4 & in_network)
+    
     def _is_private_ip(self, ip_str):
         """Helper method to check if IP is private/internal"""
         try:
@@ -302,22 +505,127 @@ class AegiswarmAnalyzer:
         except ValueError:
             return False
 
+def _analyze_line(analyzer, line):
+    """One serve-mode result line for one JSON log batch line"""
+    try:
+        results = analyzer.analyze_records(_BATCH_DECODER.decode(line).logs)
+    except msgspec.ValidationError as e:
+        results = {
+            "error": "Analysis failed",
+            "message": str(e)
+        }
+    except msgspec.DecodeError:
+        results = {
+            "error": "Invalid JSON",
+            "message": "The input line contains invalid JSON."
+        }
+    except Exception as e:
+        results = {
+            "error": "Analysis failed",
+            "message": str(e)
+        }
+    
+    return orjson.dumps(results, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY)
+
+# Decodes a serve-mode line straight into typed structs, without building a dict per log
+_BATCH_DECODER = msgspec.json.Decoder(LogBatch)
+
+_worker_analyzer = None
+
+def _init_worker():
+    global _worker_analyzer
+    _worker_analyzer = AegiswarmAnalyzer()
+
+def _analyze_line_in_worker(line):
+    return _analyze_line(_worker_analyzer, line)
+
+def _write_results(pending, failure):
+    """Write each queued result in submission order as soon as it is ready, keeping in failure
+    the error that stops the writer so the reading thread can raise it"""
+    try:
+        while True:
+            future = pending.get()
+            if future is None:
+                return
+            sys.stdout.buffer.write(future.result())
+            sys.stdout.flush()
+    except BaseException as e:
+        failure.append(e)
+
+def _queue_for_writer(pending, item, writer):
+    """Put item on the writer's queue, giving up with False once the writer has stopped"""
+    while writer.is_alive():
+        try:
+            pending.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def serve(workers=1):
+    """Answer one JSON log batch per stdin line with one JSON result line, reusing a single analyzer.
+    With several workers the batches are analyzed in parallel processes and answered in input order"""
+    lines = (line for line in sys.stdin.buffer if line.strip())
+    if workers <= 1:
+        analyzer = AegiswarmAnalyzer()
+        for line in lines:
+            sys.stdout.buffer.write(_analyze_line(analyzer, line))
+            sys.stdout.flush()
+        return
+    
+    # A bounded queue of futures keeps reading at most a few batches ahead of the output
+    pending = queue.Queue(maxsize=2 * workers)
+    failure = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        writer = threading.Thread(target=_write_results, args=(pending, failure))
+        writer.start()
+        try:
+            for line in lines:
+                future = executor.submit(_analyze_line_in_worker, line)
+                if not _queue_for_writer(pending, future, writer):
+                    future.cancel()
+                    break
+        finally:
+            _queue_for_writer(pending, None, writer)
+            writer.join()
+            if failure:
+                # Nothing will write the batches still queued or running, so drop them
+                while not pending.empty():
+                    future = pending.get_nowait()
+                    if future is not None:
+                        future.cancel()
+                executor.shutdown(cancel_futures=True)
+    
+    if failure:
+        raise failure[0]
+
 def main():
     parser = argparse.ArgumentParser(description='Aegiswarm Security Log Analyzer')
-    parser.add_argument('--input', type=str, required=True, help='Input JSON log file path')
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--input', type=str, help='Input JSON log file path')
+    mode.add_argument('--serve', action='store_true',
+                      help='Read newline-delimited JSON log batches from stdin and write one result line each')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processes analyzing --serve batches in parallel (default: 1)')
     args = parser.parse_args()
+    if args.workers != 1 and not args.serve:
+        parser.error('--workers only applies to --serve')
+    
+    if args.serve:
+        serve(args.workers)
+        return
     
     try:
-        # Load JSON log data
-        with open(args.input, 'r') as f:
-            log_data = json.load(f)
-            
-        # Analyze logs
+        # Stream the log records straight into the analyzer, so the whole
+        # file is never held in memory as Python objects at once
         analyzer = AegiswarmAnalyzer()
-        results = analyzer.analyze_logs(log_data)
+        with open(args.input, 'rb') as f:
+            results = analyzer.analyze_stream(ijson.items(f, 'logs.item', use_float=True))
         
         # Output results as JSON to stdout
-        print(json.dumps(results, indent=2))
+        sys.stdout.buffer.write(orjson.dumps(
+            results, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY
+        ))
         
     except FileNotFoundError:
         print(json.dumps({
@@ -325,7 +633,7 @@ def main():
             "message": f"The file {args.input} does not exist."
         }), file=sys.stderr)
         sys.exit(1)
-    except json.JSONDecodeError:
+    except ijson.JSONError:
         print(json.dumps({
             "error": "Invalid JSON",
             "message": "The input file contains invalid JSON."